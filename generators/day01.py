@@ -0,0 +1,9 @@
+import random
+from typing import Iterator
+
+__all__ = ['generate01']
+
+
+def generate01(size: int, rng: random.Random) -> Iterator[str]:
+    for _ in range(size):
+        yield f'{rng.choice('LR')}{rng.randint(1, 999)}'
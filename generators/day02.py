@@ -0,0 +1,18 @@
+import random
+from typing import Iterator
+
+__all__ = ['generate02']
+
+MAX_DIGITS: int = 10
+
+
+def random_range(rng: random.Random) -> str:
+    digits: int = rng.randint(1, MAX_DIGITS)
+    first: int = rng.randrange(10 ** (digits - 1), 10 ** digits)
+    span: int = rng.randint(0, max(1, 10 ** (digits - 2)))
+    last: int = min(first + span, 10 ** (digits + 1) - 1)  # at most one digit longer than first
+    return f'{first}-{last}'
+
+
+def generate02(size: int, rng: random.Random) -> Iterator[str]:
+    yield ','.join(random_range(rng) for _ in range(size))
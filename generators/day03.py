@@ -0,0 +1,11 @@
+import random
+from typing import Iterator
+
+__all__ = ['generate03']
+
+BANK_LENGTH: int = 100
+
+
+def generate03(size: int, rng: random.Random) -> Iterator[str]:
+    for _ in range(size):
+        yield ''.join(rng.choice('123456789') for _ in range(BANK_LENGTH))
@@ -0,0 +1,11 @@
+import random
+from typing import Iterator
+
+__all__ = ['generate04']
+
+ROLL_DENSITY: float = 0.6
+
+
+def generate04(size: int, rng: random.Random) -> Iterator[str]:
+    for _ in range(size):
+        yield ''.join('@' if rng.random() < ROLL_DENSITY else '.' for _ in range(size))
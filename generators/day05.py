@@ -0,0 +1,17 @@
+import random
+from typing import Iterator
+
+__all__ = ['generate05']
+
+MAX_INGREDIENT: int = 10 ** 14
+INGREDIENTS_PER_RANGE: int = 5
+
+
+def generate05(size: int, rng: random.Random) -> Iterator[str]:
+    for _ in range(size):
+        lower: int = rng.randrange(1, MAX_INGREDIENT)
+        upper: int = lower + rng.randrange(0, MAX_INGREDIENT // (10 * size))
+        yield f'{lower}-{upper}'
+    yield ''
+    for _ in range(size * INGREDIENTS_PER_RANGE):
+        yield str(rng.randrange(1, MAX_INGREDIENT))
@@ -0,0 +1,22 @@
+import random
+from typing import Iterator
+
+__all__ = ['generate06']
+
+NUMBER_ROWS: int = 4
+
+
+def random_problem(rng: random.Random) -> list[str]:
+    numbers: list[str] = [str(rng.randint(1, 9999)) for _ in range(NUMBER_ROWS)]
+    numbers.sort(key=len, reverse=rng.random() < 0.5)  # keeps the digits of every column contiguous
+    width: int = max(len(number) for number in numbers)
+    left_aligned: bool = rng.random() < 0.5
+    column: list[str] = [number.ljust(width) if left_aligned else number.rjust(width) for number in numbers]
+    column.append(rng.choice('*+').ljust(width))
+    return column
+
+
+def generate06(size: int, rng: random.Random) -> Iterator[str]:
+    problems: list[list[str]] = [random_problem(rng) for _ in range(size)]
+    for row in range(NUMBER_ROWS + 1):
+        yield ' '.join(problem[row] for problem in problems)
@@ -0,0 +1,17 @@
+import random
+from typing import Iterator
+
+__all__ = ['generate07']
+
+SPLITTER_DENSITY: float = 0.3
+
+
+def generate07(size: int, rng: random.Random) -> Iterator[str]:
+    width: int = max(size, 3)
+    start: int = width // 2
+    yield '.' * start + 'S' + '.' * (width - start - 1)
+    for row in range(1, size):
+        if row % 2:
+            yield '.' * width
+        else:
+            yield '.' + ''.join('^' if rng.random() < SPLITTER_DENSITY else '.' for _ in range(width - 2)) + '.'
@@ -0,0 +1,11 @@
+import random
+from typing import Iterator
+
+__all__ = ['generate08']
+
+MAX_COORDINATE: int = 100_000
+
+
+def generate08(size: int, rng: random.Random) -> Iterator[str]:
+    for _ in range(size):
+        yield f'{rng.randrange(MAX_COORDINATE)},{rng.randrange(MAX_COORDINATE)},{rng.randrange(MAX_COORDINATE)}'
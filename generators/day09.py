@@ -0,0 +1,39 @@
+import random
+from typing import Iterator
+
+__all__ = ['generate09']
+
+MAX_COORDINATE: int = 100_000
+
+
+def histogram_polygon(size: int, rng: random.Random) -> list[tuple[int, int]]:
+    num_columns: int = max(1, (size - 2) // 2)
+    xs: list[int] = sorted(rng.sample(range(1, MAX_COORDINATE), num_columns + 1))
+    base: int = rng.randrange(1, MAX_COORDINATE // 4)
+    heights: list[int] = []
+    for _ in range(num_columns):
+        height: int = rng.randrange(base + 1, MAX_COORDINATE)
+        while heights and height == heights[-1]:
+            height = rng.randrange(base + 1, MAX_COORDINATE)
+        heights.append(height)
+    vertices: list[tuple[int, int]] = [(xs[0], base)]
+    for column, height in enumerate(heights):
+        vertices.append((xs[column], height))
+        vertices.append((xs[column + 1], height))
+    vertices.append((xs[-1], base))
+    return vertices
+
+
+def signed_area_doubled(vertices: list[tuple[int, int]]) -> int:
+    rv: int = 0
+    for (x1, y1), (x2, y2) in zip(vertices, vertices[1:] + vertices[:1]):
+        rv += x1 * y2 - x2 * y1
+    return rv
+
+
+def generate09(size: int, rng: random.Random) -> Iterator[str]:
+    vertices: list[tuple[int, int]] = histogram_polygon(size, rng)
+    if signed_area_doubled(vertices) < 0:
+        vertices.reverse()  # solver expects clockwise winding with y pointing down
+    for x, y in vertices:
+        yield f'{x},{y}'
@@ -0,0 +1,30 @@
+import random
+from typing import Iterator
+
+__all__ = ['generate10']
+
+
+def random_machine(rng: random.Random) -> str:
+    num_lights: int = rng.randint(4, 10)
+    buttons: set[tuple[int, ...]] = set()
+    for light in range(num_lights):
+        buttons.add((light,))
+    while len(buttons) < num_lights + rng.randint(0, 3):
+        buttons.add(tuple(sorted(rng.sample(range(num_lights), rng.randint(1, num_lights)))))
+    button_list: list[tuple[int, ...]] = rng.sample(sorted(buttons), len(buttons))
+    lights: list[bool] = [False] * num_lights
+    joltages: list[int] = [0] * num_lights
+    for button in button_list:
+        presses: int = rng.randint(0, 20)
+        for light in button:
+            lights[light] ^= bool(presses % 2)
+            joltages[light] += presses
+    light_str: str = ''.join('#' if light else '.' for light in lights)
+    button_str: str = ' '.join(f'({','.join(str(light) for light in button)})' for button in button_list)
+    joltage_str: str = ','.join(str(joltage) for joltage in joltages)
+    return f'[{light_str}] {button_str} {{{joltage_str}}}'
+
+
+def generate10(size: int, rng: random.Random) -> Iterator[str]:
+    for _ in range(size):
+        yield random_machine(rng)
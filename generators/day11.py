@@ -0,0 +1,40 @@
+import math
+import random
+from typing import Iterator
+
+__all__ = ['generate11']
+
+MAX_LAYERS: int = 500
+NAME_LETTERS: str = 'abcdefghijklmnopqrstuvwxyz'
+RESERVED_NAMES: tuple[str, ...] = ('you', 'svr', 'dac', 'fft', 'out')
+
+
+def device_names(count: int, rng: random.Random) -> list[str]:
+    length: int = 3
+    while len(NAME_LETTERS) ** length < 2 * count:
+        length += 1  # three letters like the puzzle, longer once they would run out
+    names: set[str] = set()
+    while len(names) < count:
+        name: str = ''.join(rng.choice(NAME_LETTERS) for _ in range(length))
+        if name not in RESERVED_NAMES:
+            names.add(name)
+    return sorted(names)
+
+
+def generate11(size: int, rng: random.Random) -> Iterator[str]:
+    num_layers: int = min(MAX_LAYERS, max(4, math.isqrt(size)))
+    names: list[str] = device_names(max(size, num_layers), rng)
+    layers: list[list[str]] = [[] for _ in range(num_layers)]
+    for index, name in enumerate(names):
+        layers[index % num_layers].append(name)
+    layers[0].append('svr')
+    layers[1].append('you')
+    layers[num_layers // 3].append('fft')
+    layers[2 * num_layers // 3].append('dac')
+    layers.append(['out'])
+    for depth, layer in enumerate(layers[:-1]):
+        for name in layer:
+            outputs: set[str] = {rng.choice(layers[depth + 1])}
+            for _ in range(rng.randint(0, 2)):
+                outputs.add(rng.choice(layers[rng.randint(depth + 1, min(depth + 3, num_layers))]))
+            yield f'{name}: {' '.join(sorted(outputs))}'
@@ -0,0 +1,25 @@
+import random
+from typing import Iterator
+
+__all__ = ['generate12']
+
+NUM_PRESENTS: int = 6
+PRESENT_SIZE: int = 3
+
+
+def random_present(rng: random.Random) -> list[str]:
+    rows: list[str] = [''.join(rng.choice('.##') for _ in range(PRESENT_SIZE)) for _ in range(PRESENT_SIZE)]
+    rows[1] = rows[1][0] + '#' + rows[1][2]
+    return rows
+
+
+def generate12(size: int, rng: random.Random) -> Iterator[str]:
+    for present_id in range(NUM_PRESENTS):
+        yield f'{present_id}:'
+        yield from random_present(rng)
+        yield ''
+    for _ in range(size):
+        width: int = rng.randint(PRESENT_SIZE, 50)
+        height: int = rng.randint(PRESENT_SIZE, 50)
+        counts: list[int] = [rng.randint(0, 3) for _ in range(NUM_PRESENTS)]
+        yield f'{width}x{height}: {' '.join(str(count) for count in counts)}'
@@ -0,0 +1,40 @@
+import importlib
+import random
+from typing import Callable, Iterator
+
+__all__ = ['GENERATOR_LIST', 'load_generator', 'generate_input', 'Generator']
+
+
+type Generator = Callable[
+    [int, random.Random],
+    Iterator[str]
+]
+
+
+# module, size of a typical puzzle input, dimensions the size is measured in
+GENERATOR_LIST: dict[int, tuple[str, int, int]] = {
+    1:  ('day01', 4500, 1),  # rotations
+    2:  ('day02',   35, 1),  # id ranges
+    3:  ('day03',  200, 1),  # battery banks
+    4:  ('day04',  140, 2),  # grid side
+    5:  ('day05',  180, 1),  # fresh ranges, with 5 ingredients per range
+    6:  ('day06', 1000, 1),  # problems
+    7:  ('day07',  141, 2),  # manifold side
+    8:  ('day08', 1000, 1),  # junction boxes
+    9:  ('day09',  500, 1),  # red tiles
+    10: ('day10',  180, 1),  # machines
+    11: ('day11',  600, 1),  # devices
+    12: ('day12', 1000, 1)   # regions
+}
+
+
+def load_generator(day: int) -> Generator:
+    module_name, _, _ = GENERATOR_LIST[day]
+    module = importlib.import_module(f'.{module_name}', __package__)
+    return getattr(module, f'generate{day:02}')
+
+
+def generate_input(day: int, size: int, seed: int | None=None) -> list[str]:
+    assert (size >= 1), f'invalid input size {size}'
+    rng: random.Random = random.Random(day if seed is None else seed)
+    return list(load_generator(day)(size, rng))
@@ -3,59 +3,235 @@ import sys
 
 from printing.color import color_print, ASCII_RED
 
-if len(sys.argv) != 2 and len(sys.argv) != 3:
-    print(f'expected 1 or 2 arguments to main.py, got {len(sys.argv) - 1} arg(s)', file=sys.stderr, end='\n', flush=True)
-    sys.exit(1)
-
-arg: str = sys.argv[1]
-example_str: str | None = sys.argv[-1] if len(sys.argv) == 3 else None
-example: bool = False
-day: int | None = None
-run_all: bool = False
-profile_all: bool = False
-
-if example_str is not None:
-    if example_str == 'example':
-        example = True
+
+def pop_option(args: list[str], name: str) -> str | None:
+    for index, token in enumerate(args):
+        if token == name:
+            if index + 1 >= len(args):
+                print(f'expected value after {name}', file=sys.stderr, end='\n', flush=True)
+                sys.exit(1)
+            value: str = args[index + 1]
+            del args[index:index + 2]
+            return value
+        if token.startswith(f'{name}='):
+            del args[index]
+            return token.removeprefix(f'{name}=')
+    return None
+
+
+def pop_flag(args: list[str], name: str) -> bool:
+    if name in args:
+        args.remove(name)
+        return True
+    return False
+
+
+def main() -> None:
+
+    args: list[str] = sys.argv[1:]
+
+    jobs_str: str | None = pop_option(args, '--jobs')
+    jobs: int = 1
+    if jobs_str is not None:
+        try:
+            jobs = int(jobs_str)
+            if jobs < 1:
+                raise ValueError
+        except ValueError:
+            print(f'expected positive integer for --jobs, got {jobs_str!r}', file=sys.stderr, end='\n', flush=True)
+            sys.exit(1)
+
+    budget_str: str | None = pop_option(args, '--budget')
+    budget: float | None = None
+    if budget_str is not None:
+        try:
+            budget = float(budget_str)
+            if not budget > 0:
+                raise ValueError
+        except ValueError:
+            print(f'expected positive number of seconds for --budget, got {budget_str!r}', file=sys.stderr, end='\n', flush=True)
+            sys.exit(1)
+
+    timeout_str: str | None = pop_option(args, '--timeout')
+    timeout: float | None = None
+    if timeout_str is not None:
+        try:
+            timeout = float(timeout_str)
+            if not timeout > 0:
+                raise ValueError
+        except ValueError:
+            print(f'expected positive number of seconds for --timeout, got {timeout_str!r}', file=sys.stderr, end='\n', flush=True)
+            sys.exit(1)
+
+    memory_str: str | None = pop_option(args, '--memory')
+    memory: int | None = None
+    if memory_str is not None:
+        try:
+            memory = int(memory_str)
+            if memory < 1:
+                raise ValueError
+        except ValueError:
+            print(f'expected positive integer MiB for --memory, got {memory_str!r}', file=sys.stderr, end='\n', flush=True)
+            sys.exit(1)
+
+    limits: solvers.Limits | None = None
+    if timeout is not None or memory is not None:
+        limits = solvers.Limits(timeout=timeout, memory=memory)
+
+    baseline: str | None = pop_option(args, '--baseline')
+
+    socket_path: str | None = pop_option(args, '--socket')
+
+    use_cache: bool = not pop_flag(args, '--no-cache')
+    if pop_flag(args, '--clear-cache'):
+        from solvers.cache import clear_cache
+        print(f'cleared {clear_cache()} cached answer(s)', end='\n', flush=True)
+        if not args:
+            return
+
+    batch_inputs: str | None = None
+    if len(args) == 3 and args[0] == 'batch':
+        batch_inputs = args.pop()
+
+    if len(args) != 1 and len(args) != 2:
+        print(f'expected 1 or 2 arguments to main.py, got {len(args)} arg(s)', file=sys.stderr, end='\n', flush=True)
+        sys.exit(1)
+
+    arg: str = args[0]
+    example_str: str | None = args[-1] if len(args) == 2 else None
+    example: bool = False
+    from_stdin: bool = False
+    day: int | None = None
+    run_all: bool = False
+    profile_all: bool = False
+    memory_profile_all: bool = False
+    compare_all: bool = False
+    serving: bool = False
+    day_mode: str | None = None
+
+    if arg in ('scale', 'hotspots', 'batch'):
+        if example_str is None or (arg == 'batch' and batch_inputs is None):
+            print(f"expected day number after {repr(arg)}{', then input directory or glob' if arg == 'batch' else ''}", file=sys.stderr, end='\n', flush=True)
+            sys.exit(1)
+        day_mode = arg
+        arg, example_str = example_str, None
+
+    if example_str is not None:
+        if example_str == 'example':
+            example = True
+        elif example_str == '-':
+            from_stdin = True
+        else:
+            print(f"expected 'example', '-' or nothing for trialing argument, got {repr(arg)}", file=sys.stderr, end='\n', flush=True)
+            sys.exit(1)
+
+    if arg == 'latest':
+        pass
+    elif arg == 'all':
+        if example:
+            print(f"got 'example' with 'all', not supported", file=sys.stderr, end='\n', flush=True)
+            sys.exit(1)
+        day = None
+        run_all = True
+    elif arg == 'profile':
+        if example:
+            print(f"got 'example' with 'profile', not supported", file=sys.stderr, end='\n', flush=True)
+            sys.exit(1)
+        day = None
+        profile_all = True
+    elif arg == 'compare':
+        if example:
+            print(f"got 'example' with 'compare', not supported", file=sys.stderr, end='\n', flush=True)
+            sys.exit(1)
+        day = None
+        compare_all = True
+    elif arg == 'serve':
+        if example:
+            print(f"got 'example' with 'serve', not supported", file=sys.stderr, end='\n', flush=True)
+            sys.exit(1)
+        day = None
+        serving = True
+    elif arg == 'memprofile':
+        if example:
+            print(f"got 'example' with 'memprofile', not supported", file=sys.stderr, end='\n', flush=True)
+            sys.exit(1)
+        day = None
+        memory_profile_all = True
     else:
-        print(f"expected 'example' or nothing for trialing argument, got {repr(arg)}", file=sys.stderr, end='\n', flush=True)
+        try:
+            day = int(arg)
+            if not 1 <= day <= 12:
+                raise ValueError
+        except ValueError as ex:
+            print(f"expected 'latest', 'all', 'profile', 'compare', 'memprofile', 'scale', 'hotspots', 'batch', 'serve', or day number as integer 1 to 12, got {repr(arg)}", file=sys.stderr, end='\n', flush=True)
+            sys.exit(1)
+
+    if day_mode is not None and day is None:
+        print(f"expected day number as integer 1 to 12 after {repr(day_mode)}, got {repr(arg)}", file=sys.stderr, end='\n', flush=True)
+        sys.exit(1)
+
+    if from_stdin and (run_all or profile_all or compare_all or memory_profile_all or serving):
+        print(f"got '-' with {repr(arg)}, stdin input only supported with a single day", file=sys.stderr, end='\n', flush=True)
+        sys.exit(1)
+
+    if from_stdin and limits is not None:
+        print(f"got '-' with '--timeout' or '--memory', not supported", file=sys.stderr, end='\n', flush=True)
+        sys.exit(1)
+
+    if jobs > 1 and not (run_all or profile_all or compare_all or memory_profile_all or serving or day_mode == 'batch'):
+        print(f"got '--jobs' with a single day, only supported with 'all', 'profile', 'compare', 'memprofile', 'batch' or 'serve'", file=sys.stderr, end='\n', flush=True)
         sys.exit(1)
 
-if arg == 'latest':
-    pass
-elif arg == 'all':
-    if example:
-        print(f"got 'example' with 'all', not supported", file=sys.stderr, end='\n', flush=True)
+    if budget_str is not None and not (profile_all or compare_all or day_mode == 'scale'):
+        print(f"got '--budget' without 'profile', 'compare' or 'scale', not supported", file=sys.stderr, end='\n', flush=True)
         sys.exit(1)
-    day = None
-    run_all = True
-elif arg == 'profile':
-    if example:
-        print(f"got 'example' with 'profile', not supported", file=sys.stderr, end='\n', flush=True)
+
+    if baseline is not None and not compare_all:
+        print(f"got '--baseline' without 'compare', not supported", file=sys.stderr, end='\n', flush=True)
+        sys.exit(1)
+
+    if socket_path is not None and not serving:
+        print(f"got '--socket' without 'serve', not supported", file=sys.stderr, end='\n', flush=True)
         sys.exit(1)
-    day = None
-    profile_all = True
-else:
+
     try:
-        day = int(arg)
-        if not 1 <= day <= 12:
-            raise ValueError
-    except ValueError as ex:
-        print(f"expected 'latest', 'all', 'profile', or day number as integer 1 to 12, got {repr(arg)}", file=sys.stderr, end='\n', flush=True)
-        sys.exit(1)
-
-try:
-    if profile_all:
-        solvers.profile()
-    elif run_all:
-        solvers.solve_all()
-    else:
-        solvers.solve(day, example)
+        if profile_all:
+            from solvers import profiling
+            profiling.profile(jobs, budget, limits)
+        elif compare_all:
+            from solvers import profiling
+            profiling.compare(jobs, budget, limits, baseline)
+        elif memory_profile_all:
+            from solvers import profiling
+            profiling.memprofile(jobs, limits)
+        elif day_mode == 'scale':
+            assert (day is not None), 'scale needs a day'
+            from solvers import scaling
+            scaling.scale(day, budget, limits)
+        elif day_mode == 'hotspots':
+            assert (day is not None), 'hotspots needs a day'
+            from solvers import hotspots
+            hotspots.hotspots(day, limits)
+        elif day_mode == 'batch':
+            assert (day is not None and batch_inputs is not None), 'batch needs a day and inputs'
+            from solvers import batch
+            batch.batch(day, batch_inputs, jobs, limits)
+        elif serving:
+            from solvers import server
+            server.serve(socket_path, jobs, limits)
+        elif run_all:
+            solvers.solve_all(jobs, use_cache, limits)
+        else:
+            solvers.solve(day, example, use_cache, limits, from_stdin)
+
+    except KeyboardInterrupt as err:
+        color_print('solver cancelled by user', end='\n', flush=True, color=ASCII_RED)
+        sys.exit(1)
+
+    except solvers.SolverError as err:
+        color_print(err, end='\n', flush=True, color=ASCII_RED)
+        sys.exit(1)
 
-except KeyboardInterrupt as err:
-    color_print('solver cancelled by user', end='\n', flush=True, color=ASCII_RED)
-    sys.exit(1)
 
-except solvers.SolverError as err:
-    color_print(err, end='\n', flush=True, color=ASCII_RED)
-    sys.exit(1)
+if __name__ == '__main__':
+    main()
@@ -13,7 +13,9 @@ ASCII_PURPLE: int = 95
 ASCII_CYAN: int = 96
 
 
-def color_print(*args, sep: str=' ', end: str='\n', file: TextIO=sys.stdout, flush: bool=True, color: int | None=None) -> None:
+def color_print(*args, sep: str=' ', end: str='\n', file: TextIO | None=None, flush: bool=True, color: int | None=None) -> None:
+    if file is None:
+        file = sys.stdout  # looked up per call so redirected output is respected
     if color is not None:
         __PRINT(f'\033[{color}m{sep.join((str(a) for a in args))}\033[00m', sep='', end=end, file=file, flush=flush)
     else:
@@ -0,0 +1,89 @@
+import glob
+import json
+import os
+from collections.abc import Iterator
+from functools import partial
+from typing import Any
+
+from .solve import SolverError, get_solver_for, solve_input
+from .limits import Limits
+
+__all__ = ['batch']
+
+
+IN_FLIGHT_PER_JOB: int = 2  # files submitted ahead of each worker, bounds memory held by pending results
+
+
+def batch_input_paths(inputs: str) -> Iterator[str]:
+    if os.path.isdir(inputs):
+        for entry in sorted(os.scandir(inputs), key=lambda entry: entry.name):
+            if entry.is_file() and not entry.name.startswith('.'):
+                yield entry.path
+        return
+    for path in glob.iglob(inputs, recursive=True):
+        if os.path.isfile(path):
+            yield path
+
+
+def batch_records(day: int, paths: Iterator[str], jobs: int, limits: Limits | None, fresh_processes: bool=False) -> Iterator[tuple[str, dict[str, Any] | str]]:
+    if jobs <= 1 and limits is None and not fresh_processes:
+        for path in paths:
+            yield path, solve_input(day, path)
+        return
+    if limits is not None:
+        yield from supervised_batch_records(day, paths, jobs, limits)
+        return
+    from .pools import RecoveringProcessPool, crash_message
+    pool: RecoveringProcessPool[str, dict[str, Any] | str] = RecoveringProcessPool(lambda path: partial(solve_input, day, path), jobs, fresh_processes)
+    try:
+        for path in paths:
+            if len(pool) >= jobs * IN_FLIGHT_PER_JOB:
+                for done in pool.completed():
+                    yield done, pool.result(done, crash_message(day))
+            pool.submit(path)
+        while len(pool):
+            for done in pool.completed():
+                yield done, pool.result(done, crash_message(day))
+    except BaseException:
+        pool.shutdown(cancel=True)
+        raise
+    pool.shutdown()
+
+
+def supervised_batch_records(day: int, paths: Iterator[str], jobs: int, limits: Limits) -> Iterator[tuple[str, dict[str, Any] | str]]:
+    from concurrent.futures import Future, FIRST_COMPLETED, ThreadPoolExecutor, wait
+    from .supervise import run_supervised
+    executor: ThreadPoolExecutor = ThreadPoolExecutor(max_workers=jobs)  # each thread supervises its own child process
+    pending: dict[Future[dict[str, Any] | str], str] = {}
+    try:
+        for path in paths:
+            if len(pending) >= jobs * IN_FLIGHT_PER_JOB:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield pending.pop(future), future.result()
+            pending[executor.submit(run_supervised, partial(solve_input, input_path=path), day, limits)] = path
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield pending.pop(future), future.result()
+    except BaseException:
+        executor.shutdown(wait=False, cancel_futures=True)
+        raise
+    executor.shutdown()
+
+
+def batch(day: int, inputs: str, jobs: int = 1, limits: Limits | None=None) -> None:
+    day, info, _ = get_solver_for(day)
+    count: int = 0
+    failures: int = 0
+    for path, outcome in batch_records(day, batch_input_paths(inputs), jobs, limits, fresh_processes=not info.pure):
+        count += 1
+        if isinstance(outcome, str):
+            failures += 1
+            print(json.dumps({'input': path, 'day': day, 'error': outcome}), end='\n', flush=True)
+        else:
+            print(json.dumps({'input': path} | outcome, default=str), end='\n', flush=True)
+    if count == 0:
+        raise SolverError(f'no input files found for {inputs!r}')
+    if failures:
+        raise SolverError(f'{failures} of {count} input(s) failed for day {day}')
@@ -0,0 +1,120 @@
+import gc
+import math
+import statistics
+import time
+from collections.abc import Callable
+
+from .limits import expect_runs
+
+__all__ = ['BenchmarkResult', 'benchmark', 'slower_p_value', 'DEFAULT_BUDGET']
+
+
+DEFAULT_BUDGET: float = 2.0    # seconds of timed rounds per benchmark
+TARGET_ROUNDS: int = 15
+MIN_ROUNDS: int = 5
+MIN_ROUND_TIME: float = 0.005  # seconds, keeps timer resolution out of fast rounds
+OVERHEAD_ROUNDS: int = 5
+CALIBRATION_REPEATS: int = 3   # timings per iteration count, the fastest one calibrates
+CALIBRATION_SHARE: float = 0.2  # of the budget, at most spent repeating calibration timings
+TUKEY_FENCE: float = 1.5
+
+
+class BenchmarkResult:
+
+    __slots__ = ['minimum', 'median', 'p95', 'stdev', 'rounds', 'rejected', 'iterations', 'overhead', 'times']
+
+    def __init__(self, *, minimum: float, median: float, p95: float, stdev: float, rounds: int, rejected: int, iterations: int, overhead: float, times: list[float]) -> None:
+        self.minimum = minimum  # all times in ms per iteration, overhead subtracted
+        self.median = median
+        self.p95 = p95
+        self.stdev = stdev
+        self.rounds = rounds
+        self.rejected = rejected
+        self.iterations = iterations
+        self.overhead = overhead
+        self.times = times      # kept rounds, in the order they ran
+
+    @property
+    def samples(self) -> int:
+        return (self.rounds + self.rejected) * self.iterations
+
+
+def time_round(task: Callable[[], object], iterations: int) -> float:
+    expect_runs(iterations)
+    gc.collect()
+    gc_was_enabled: bool = gc.isenabled()
+    gc.disable()
+    try:
+        start: float = time.perf_counter()
+        for _ in range(iterations):
+            task()
+        return time.perf_counter() - start
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+
+def calibrate(task: Callable[[], object], budget: float, min_rounds: int=MIN_ROUNDS) -> tuple[int, int]:
+    iterations: int = 1
+    spent: float = 0.0
+    while True:
+        round_time: float = math.inf
+        for _ in range(CALIBRATION_REPEATS):
+            elapsed: float = time_round(task, iterations)
+            spent += elapsed
+            round_time = min(round_time, elapsed)  # a GC pause or scheduler hiccup only ever adds time
+            if round_time < MIN_ROUND_TIME or spent > budget * CALIBRATION_SHARE:
+                break
+        if round_time >= MIN_ROUND_TIME:
+            break
+        iterations *= 2
+    single_time: float = round_time / iterations
+    target_rounds: int = max(TARGET_ROUNDS, min_rounds)
+    if single_time * target_rounds > budget:
+        return max(min_rounds, min(target_rounds, int(budget / single_time))), 1
+    return target_rounds, max(iterations, int(budget / (target_rounds * single_time)))
+
+
+def reject_outliers(times: list[float]) -> list[float]:
+    if len(times) < 4:
+        return times
+    q1, _, q3 = statistics.quantiles(times, n=4, method='inclusive')
+    fence: float = TUKEY_FENCE * (q3 - q1)
+    return [t for t in times if q1 - fence <= t <= q3 + fence]
+
+
+def benchmark(task: Callable[[], object], baseline: Callable[[], object], budget: float=DEFAULT_BUDGET, min_rounds: int=MIN_ROUNDS) -> BenchmarkResult:
+    expect_runs(1)
+    task()  # warm up run
+    rounds, iterations = calibrate(task, budget, min_rounds)
+    overhead: float = min(time_round(baseline, iterations) for _ in range(OVERHEAD_ROUNDS)) / iterations
+    times: list[float] = [max(0.0, time_round(task, iterations) / iterations - overhead) * 1000.0 for _ in range(rounds)]
+    kept: list[float] = reject_outliers(times)
+    return BenchmarkResult(
+        minimum=min(kept),
+        median=statistics.median(kept),
+        p95=statistics.quantiles(kept, n=20, method='inclusive')[18] if len(kept) > 1 else kept[0],
+        stdev=statistics.stdev(kept) if len(kept) > 1 else 0.0,
+        rounds=len(kept),
+        rejected=len(times) - len(kept),
+        iterations=iterations,
+        overhead=overhead * 1000.0,
+        times=kept)
+
+
+def slower_p_value(current: list[float], baseline: list[float]) -> float:
+    # one sided Mann-Whitney U test, normal approximation with tie and continuity correction
+    n1, n2 = len(current), len(baseline)
+    if n1 == 0 or n2 == 0:
+        return 1.0
+    u: float = sum(1.0 if c > b else 0.5 if c == b else 0.0 for c in current for b in baseline)
+    n: int = n1 + n2
+    tie_counts: dict[float, int] = {}
+    for t in current + baseline:
+        tie_counts[t] = tie_counts.get(t, 0) + 1
+    ties: int = sum(count ** 3 - count for count in tie_counts.values())
+    variance: float = n1 * n2 / 12.0 * ((n + 1) - ties / (n * (n - 1)))
+    if variance <= 0.0:
+        return 1.0
+    z: float = (u - n1 * n2 / 2.0 - 0.5) / math.sqrt(variance)
+    return 0.5 * math.erfc(z / math.sqrt(2.0))
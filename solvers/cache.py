@@ -0,0 +1,107 @@
+import hashlib
+import json
+import os
+import sys
+from collections.abc import Callable
+from types import ModuleType
+from typing import Any
+
+__all__ = ['cache_key', 'load_answers', 'store_answers', 'clear_cache']
+
+
+CACHE_DIRECTORY: str = 'cache/2025/answers'
+MAX_ENTRIES: int = 256
+KEY_VERSION: bytes = b'aoc-answer-cache-2'
+
+
+def source_path_under(module: ModuleType, root: str) -> str | None:
+    module_file: str | None = getattr(module, '__file__', None)
+    if module_file is None or not os.path.abspath(module_file).startswith(root + os.sep):
+        return None
+    return module_file
+
+
+def solver_source_paths(solver: Callable[..., Any]) -> list[str]:
+    # the solver's module and every project module it reaches through its globals, so an edit to a
+    # shared structure invalidates its answers, while modules loaded by other days never change the key
+    module: ModuleType = sys.modules[solver.__module__]
+    module_file: str | None = getattr(module, '__file__', None)
+    assert (module_file is not None), f'cannot locate source of solver {solver.__qualname__}'
+    root: str = os.path.dirname(os.path.dirname(os.path.abspath(module_file)))  # the directory holding the solvers package
+    seen: dict[str, str] = {}
+    pending: list[ModuleType] = [module]
+    while pending:
+        module = pending.pop()
+        module_file = source_path_under(module, root)
+        if module.__name__ in seen or module_file is None:
+            continue
+        seen[module.__name__] = module_file
+        for value in vars(module).values():
+            dependency: ModuleType | None = value if isinstance(value, ModuleType) else sys.modules.get(getattr(value, '__module__', None) or '')
+            if dependency is not None and not dependency.__name__.startswith(module.__name__ + '.'):
+                pending.append(dependency)  # submodules appear on a package as they load, whoever imports them
+    return sorted(seen.values())
+
+
+def cache_key(day: int, example: bool, input_paths: list[str], solver: Callable[..., Any]) -> str:
+    digest = hashlib.sha256(KEY_VERSION)
+    digest.update(f'day {day} example {example}'.encode())
+    for path in input_paths + solver_source_paths(solver):
+        with open(path, 'rb') as file:
+            digest.update(hashlib.file_digest(file, 'sha256').digest())
+    return digest.hexdigest()
+
+
+def entry_path(key: str) -> str:
+    return os.path.join(CACHE_DIRECTORY, f'{key}.json')
+
+
+def load_answers(key: str) -> tuple[Any, Any, float] | None:
+    path: str = entry_path(key)
+    try:
+        with open(path) as file:
+            entry: dict[str, Any] = json.load(file)
+        os.utime(path)  # mtime orders eviction, so a hit counts as a use
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+    return entry['part1'], entry['part2'], entry['time']
+
+
+def store_answers(key: str, part1: Any, part2: Any, time_taken: float) -> None:
+    try:
+        encoded: str = json.dumps({'part1': part1, 'part2': part2, 'time': time_taken})
+    except TypeError:
+        return  # answers that do not round trip through JSON are never cached
+    os.makedirs(CACHE_DIRECTORY, exist_ok=True)
+    temporary_path: str = entry_path(key) + '.tmp'
+    with open(temporary_path, 'w') as file:
+        file.write(encoded)
+    os.replace(temporary_path, entry_path(key))
+    evict(MAX_ENTRIES)
+
+
+def cache_entries() -> list[str]:
+    try:
+        names: list[str] = os.listdir(CACHE_DIRECTORY)
+    except FileNotFoundError:
+        return []
+    return [os.path.join(CACHE_DIRECTORY, name) for name in names if name.endswith('.json')]
+
+
+def evict(max_entries: int) -> None:
+    entries: list[str] = cache_entries()
+    if len(entries) <= max_entries:
+        return
+    entries.sort(key=os.path.getmtime)
+    for path in entries[:len(entries) - max_entries]:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass  # another process evicted it first
+
+
+def clear_cache() -> int:
+    entries: list[str] = cache_entries()
+    for path in entries:
+        os.remove(path)
+    return len(entries)
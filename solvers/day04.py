@@ -1,37 +1,32 @@
 from typing import Iterator
 
+import numpy as np
+
 from structures.grid import Grid
-from structures.points import Point
+from .phases import phase, PARSE, PART1
 
 
 __all__ = ['solve04']
 
 
-def elf_trip(grid: Grid, roll_locations: list[Point]) -> tuple[int, list[Point]]:
-    num_removed: int = 0
-    new_roll_locations: list[Point] = []
-    removed_roll_locations: list[Point] = []
-    for point in roll_locations:
-        if grid.count_neighbours(point, '@') < 4:
-            num_removed += 1
-            removed_roll_locations.append(point)
-        else:
-            new_roll_locations.append(point)
-    grid.set_all(removed_roll_locations, '.')
-    return num_removed, new_roll_locations
+def elf_trip(grid: Grid) -> int:
+    removable: np.ndarray = grid.mask_with_fewer_neighbours('@', 4)
+    grid.set_all(np.nonzero(removable), '.')
+    return int(np.count_nonzero(removable))
 
 
 def solve04(lines: Iterator[str]) -> Iterator[int]:
 
+    phase(PARSE)
     grid: Grid
     grid, _ = Grid.parse(lines, '.@x')
 
-    roll_locations: list[Point] = grid.locations_of('@')
-    num_removed, roll_locations = elf_trip(grid, roll_locations)
+    phase(PART1)
+    num_removed: int = elf_trip(grid)
     yield num_removed
 
     total_removed: int = num_removed
     while num_removed:
-        num_removed, roll_locations = elf_trip(grid, roll_locations)
+        num_removed = elf_trip(grid)
         total_removed += num_removed
     yield total_removed
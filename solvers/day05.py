@@ -1,6 +1,8 @@
 from collections import defaultdict
 from typing import Iterator, cast
 
+from .phases import phase, PARSE, PREPROCESS, PART1
+
 
 __all__ = ['solve05']
 
@@ -140,11 +142,14 @@ def sum_sorted_non_overlapping_ranges(fresh_ranges: list[FreshRange]) -> int:
 
 def solve05(lines: Iterator[str]) -> Iterator[int]:
 
+    phase(PARSE)
     fresh_ranges: list[FreshRange] = parse_fresh_ranges(lines)
+    phase(PREPROCESS)
     fresh_ranges = eliminate_by_same_lower_or_same_bound(fresh_ranges)
     fresh_ranges = join_adjacent(fresh_ranges)
     fresh_ranges = to_sorted_non_overlapping_ranges(fresh_ranges)
     fresh_ranges = join_adjacent(fresh_ranges)
 
+    phase(PART1)
     yield number_of_fresh_ingredients(lines, fresh_ranges)
     yield sum_sorted_non_overlapping_ranges(fresh_ranges)
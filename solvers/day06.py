@@ -2,6 +2,8 @@ from typing import Iterator
 
 import numpy as np
 
+from .phases import phase, PARSE, PART1
+
 
 __all__ = ['solve06']
 
@@ -71,9 +73,11 @@ def part2_total(lines: list[str]) -> int:
 
 def solve06(lines: Iterator[str]) -> Iterator[int]:
 
+    phase(PARSE)
     normal: list[str] = list(lines)
     transposed: list[str] = transpose_lines(normal)
 
+    phase(PART1)
     part1: int = part1_total(normal)
     yield part1
 
@@ -3,6 +3,7 @@ from typing import Iterator
 import numpy as np
 
 from structures.algorithms import UnionFind
+from .phases import phase, PARSE, PREPROCESS, PART1
 
 
 __all__ = ['solve08']
@@ -28,14 +29,18 @@ def sorted_distances_squared_indexed(int_to_point: list[tuple[int, int, int]]) -
 
 def solve08(lines: Iterator[str]) -> Iterator[int]:
 
+    phase(PARSE)
     points = parse_points_enumerated(lines)
     num_points: int = len(points)
     num_connections_required = 10 if num_points == 20 else 1000
 
     circuits: UnionFind = UnionFind(num_points)
 
+    phase(PREPROCESS)
     pairs: list[tuple[int, int, int]] = sorted_distances_squared_indexed(points)
 
+    phase(PART1)
+
     connection_attempts: int = 0
     num_connections: int = 0
     done_part: bool = False
@@ -4,8 +4,11 @@ from collections import defaultdict
 
 import numpy as np
 
-from structures.grid import Grid
-from structures.points import Point, Dimensions
+from structures.compressedgrid import CompressedGrid
+from structures.grid import Grid, SummedAreaTable
+from structures.points import Point
+from structures.polygon import rectilinear_polygon_mask
+from .phases import phase, PARSE, PREPROCESS, PART1
 
 __all__ = ['solve09']
 
@@ -24,19 +27,6 @@ def bounding_rect_area(p1: Point, p2: Point) -> int:
     return dx * dy
 
 
-def get_bounds(points: list[Point]) -> Dimensions:
-    max_x: int = points[0].x
-    max_y: int = points[0].y
-    for point in points[1:]:
-        if point.x > max_x:
-            max_x = point.x
-        if point.y > max_y:
-            max_y = point.y
-    width: int = max_x + 1
-    height: int = max_y + 1
-    return Dimensions(width=width, height=height)
-
-
 def group_by_x_and_y(points: list[Point]) -> tuple[dict[int, list[int]], dict[int, list[int]]]:
     x_to_ys: dict[int, list[int]] = defaultdict(list)
     y_to_xs: dict[int, list[int]] = defaultdict(list)
@@ -48,99 +38,6 @@ def group_by_x_and_y(points: list[Point]) -> tuple[dict[int, list[int]], dict[in
     return x_to_ys, y_to_xs
 
 
-def create_grid(points: list[Point]) -> tuple[Dimensions, Grid]:
-    dimensions = get_bounds(points)
-    grid: Grid = Grid.blank(dimensions, ' X-v^')
-    for point in points:
-        grid[point] = 'X'
-    return dimensions, grid
-
-
-def draw_lines(grid: Grid, points: list[Point]) -> None:
-
-    for p1, p2 in zip(points, [points[-1]] + points[:-1]):
-        grid.draw_ortholine_exclusive_no_overlap(p1, p2, '-')
-
-
-def draw_vlines(grid: Grid, points: list[Point], reverse:bool = False):
-    for p1, p2 in zip(points, [points[-1]] + points[:-1]):
-        if p1.x == p2.x:
-            if p1.y > p2.y:
-                grid.draw_ortholine(p1, p2, '^' if reverse else 'v')
-            else:
-                grid.draw_ortholine(p1, p2, 'v' if reverse else '^')
-
-
-def iter_four_corners(areas: list[tuple[int, Point, Point]]) -> Iterator[tuple[int, tuple[Point, Point], tuple[Point, Point]]]:
-    for a, p1, p2 in areas:
-        p3 = Point(x=p1.x, y=p2.y)
-        p4 = Point(x=p2.x, y=p1.y)
-        yield a, (p1, p2), (p3, p4)
-
-
-def iter_four_corners_each_inside(grid: np.ndarray, memo: np.ndarray, areas: list[tuple[int, Point, Point]], DOWN_ARROW: int, UP_ARROW: int) -> Iterator[tuple[int, tuple[Point, Point], tuple[Point, Point]]]:
-    for a, (p1, p2), (p3, p4) in iter_four_corners(areas):
-        if is_inside_recursive(grid, memo, p3.x, p3.y, DOWN_ARROW, UP_ARROW) and is_inside_recursive(grid, memo, p4.x, p4.y, DOWN_ARROW, UP_ARROW):
-            yield a, (p1, p2), (p3, p4)
-
-
-def __is_inside_but_not_boundary_recursive(grid: np.ndarray, memo: np.ndarray, x: int, y: int, DOWN_ARROW: int, UP_ARROW: int) -> bool:
-
-    yx: tuple[int, int] = y, x
-    if memo[yx] == 0:
-
-        # right is off the grid, so we are outside
-        if x + 1 >= grid.shape[1]:
-            memo[yx] = 2
-            return False
-
-        right: tuple[int, int] = y, x + 1
-        if grid[right] == DOWN_ARROW:
-            memo[yx] = 1
-            return True
-
-        if grid[right] == UP_ARROW:
-            memo[yx] = 2
-            return False
-
-        if __is_inside_but_not_boundary_recursive(grid, memo, right[1], right[0], DOWN_ARROW, UP_ARROW):
-            memo[yx] = 1
-            return True
-        else:
-            memo[yx] = 2
-            return False
-
-    else:
-        return memo[yx] == 1
-
-
-def is_inside_recursive(grid: np.ndarray, memo: np.ndarray, x: int, y: int, DOWN_ARROW: int, UP_ARROW: int) -> bool:
-    if grid[(y, x)]:
-        return True
-    return __is_inside_but_not_boundary_recursive(grid, memo, x, y, DOWN_ARROW, UP_ARROW)
-
-
-def walk_two_points_all_inside(grid: np.ndarray, memo: np.ndarray, p1: Point, p2: Point, DOWN_ARROW: int, UP_ARROW: int) -> bool:
-    if p1.x == p2.x:
-        x = p1.x
-        for y in range(min((p1.y, p2.y)), max((p1.y, p2.y)) + 1):
-            if not is_inside_recursive(grid, memo, x, y, DOWN_ARROW, UP_ARROW):
-                return False
-    else:
-        y = p1.y
-        for x in range(min((p1.x, p2.x)), max((p1.x, p2.x)) + 1):
-            if not is_inside_recursive(grid, memo, x, y, DOWN_ARROW, UP_ARROW):
-                return False
-    return True
-
-
-def walk_points_all_inside(grid: np.ndarray, memo: np.ndarray, points: list[Point], DOWN_ARROW: int, UP_ARROW: int) -> bool:
-    for p1, p2 in zip(points, [points[-1]] + points[:-1]):
-        if not walk_two_points_all_inside(grid, memo, p1, p2, DOWN_ARROW, UP_ARROW):
-            return False
-    return True
-
-
 def get_top_left_point(points: list[Point]) -> Point:
     min_x: int = -1
     for p in points:
@@ -154,20 +51,19 @@ def get_top_left_point(points: list[Point]) -> Point:
     return Point(x=min_x, y=min_y)
 
 
-def solve_part2(points: list[Point], areas: list[tuple[int, Point, Point]]) -> tuple[int, Point, Point]:
+def solve_part2(grid: Grid, points: list[Point], areas: list[tuple[int, Point, Point]]) -> tuple[int, Point, Point]:
 
-    dimensions, grid = create_grid(points)
-    draw_lines(grid, points)
-    draw_vlines(grid, points)
-    DOWN_ARROW: int = grid.symbols.index('v')
-    UP_ARROW: int = grid.symbols.index('^')
-    cells: np.ndarray = grid.cells
+    grid.set_all(np.nonzero(rectilinear_polygon_mask(points, grid.dimensions)), '#')
+    inside: SummedAreaTable = grid.summed_area_table('#')
 
-    memo : np.ndarray = np.zeros([grid.dimensions.height, grid.dimensions.width], dtype=np.uint8)
-    for a, (p1, p2), (p3, p4) in iter_four_corners_each_inside(cells, memo, areas, DOWN_ARROW, UP_ARROW):
-        if walk_points_all_inside(cells, memo, [p1, p3, p2, p4], DOWN_ARROW, UP_ARROW):
-            return a, p1, p2
-    raise AssertionError('did not find solution to Part 2')
+    x1: np.ndarray = np.array([p1.x for _, p1, _ in areas])
+    y1: np.ndarray = np.array([p1.y for _, p1, _ in areas])
+    x2: np.ndarray = np.array([p2.x for _, _, p2 in areas])
+    y2: np.ndarray = np.array([p2.y for _, _, p2 in areas])
+    all_inside: np.ndarray = inside.counts(x1, y1, x2, y2) == (np.abs(x1 - x2) + 1) * (np.abs(y1 - y2) + 1)
+    if not all_inside.any():
+        raise AssertionError('did not find solution to Part 2')
+    return areas[int(np.argmax(all_inside))]  # areas are sorted largest first
 
 
 def all_areas(points: list[Point]) -> list[tuple[int, Point, Point]]:
@@ -180,71 +76,22 @@ def all_areas(points: list[Point]) -> list[tuple[int, Point, Point]]:
     return rv
 
 
-def sorted_xs_and_ys(points: list[Point]) -> tuple[list[int], list[int]]:
-    xs: set[int] = set()
-    ys: set[int] = set()
-    for point in points:
-        xs.add(point.x)
-        ys.add(point.y)
-    return sorted(xs), sorted(ys)
-
-
-def unsquish_point(point: Point, xs: list[int], ys:list[int]) -> Point:
-    return Point(x=xs[point.x], y=ys[point.y])
-
-
-def unsquish_area(rect: tuple[int, Point, Point], xs: list[int], ys:list[int]) -> tuple[int, Point, Point]:
-    a, p1, p2 = rect
-    p1, p2 = unsquish_point(p1, xs, ys), unsquish_point(p2, xs, ys)
-    return a, p1, p2
-
-
-def to_reverse_dict(values: list[int]) -> dict[int, int]:
-    rv: dict[int, int] = {}
-    for index, value in enumerate(values):
-        rv[value] = index
-    return rv
-
-
-def squish_point(point: Point, xs_lookup: dict[int, int], ys_lookup: dict[int, int]) -> Point:
-    return Point(x=xs_lookup[point.x], y=ys_lookup[point.y])
-
-
-def squish_points(points: list[Point], xs_lookup: dict[int, int], ys_lookup: dict[int, int]) -> list[Point]:
-    rv: list[Point] = []
-    for point in points:
-        rv.append(squish_point(point, xs_lookup, ys_lookup))
-    return rv
-
-
-def squish_area(area: tuple[int, Point, Point], xs_lookup: dict[int, int], ys_lookup: dict[int, int]) -> tuple[int, Point, Point]:
-    a, p1, p2 = area
-    p1, p2 = squish_point(p1, xs_lookup, ys_lookup), squish_point(p2, xs_lookup, ys_lookup)
-    return a, p1, p2
-
-
-def squish_areas(areas: list[tuple[int, Point, Point]], xs_lookup: dict[int, int], ys_lookup: dict[int, int]) -> list[tuple[int, Point, Point]]:
-    rv: list[tuple[int, Point, Point]] = []
-    for area in areas:
-        rv.append(squish_area(area, xs_lookup, ys_lookup))
-    return rv
-
-
 def solve09(lines: Iterator[str]) -> Iterator[int]:
 
+    phase(PARSE)
     points: list[Point] = parse_points(lines)
+    phase(PREPROCESS)
     areas: list[tuple[int, Point, Point]] = all_areas(points)
 
+    phase(PART1)
     part1: int = areas[0][0]
     # assert 4771532800 == part1
     yield part1
 
-    xs, ys = sorted_xs_and_ys(points)
-    xs_lookup: dict[int, int] = to_reverse_dict(xs)
-    ys_lookup: dict[int, int] = to_reverse_dict(ys)
-    squished_points: list[Point] = squish_points(points, xs_lookup, ys_lookup)
-    squished_areas = squish_areas(areas, xs_lookup, ys_lookup)
-    largest_rect: tuple[int, Point, Point] = solve_part2(squished_points, squished_areas)
-    part2: int = unsquish_area(largest_rect, xs, ys)[0]
+    compressed: CompressedGrid = CompressedGrid.from_points([point.x for point in points], [point.y for point in points], '.#')
+    squished: dict[Point, Point] = dict(zip(points, compressed.compress_points(points)))
+    squished_points: list[Point] = [squished[point] for point in points]
+    squished_areas: list[tuple[int, Point, Point]] = [(a, squished[p1], squished[p2]) for a, p1, p2 in areas]
+    part2: int = solve_part2(compressed.grid, squished_points, squished_areas)[0]
     # assert 1544362560 == part2
     yield part2
@@ -1,5 +1,7 @@
 from typing import Iterator, cast
 
+from .phases import phase, PARSE, PART1
+
 __all__ = ['solve11']
 
 
@@ -100,7 +102,9 @@ def solve11(lines: Iterator[str],
 
     else:
 
+        phase(PARSE)
         devices, num_devices, (you, svr, dac, fft, out) = parse_devices(lines, ('you', 'svr', 'dac', 'fft', 'out'))
+        phase(PART1)  # both parts share one memoised search, so Part 2 is charged here
         part1, part2 = solve(devices, num_devices, you, svr, dac, fft, out)
         yield part1
         yield part2
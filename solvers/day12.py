@@ -2,7 +2,6 @@ import itertools
 from typing import Iterator
 
 import numpy as np
-from numpy.f2py.rules import sepdict
 
 from printing.debug import print
 from structures.grid import Grid
@@ -1,20 +1,8 @@
+import importlib
 from enum import Enum
 from typing import Any, Callable, Iterator
 
-from .day01 import *
-from .day02 import *
-from .day03 import *
-from .day04 import *
-from .day05 import *
-from .day06 import *
-from .day07 import *
-from .day08 import *
-from .day09 import *
-from .day10 import *
-from .day11 import *
-from .day12 import *
-
-__all__ = ['SOLVER_LIST', 'Solver', 'SolverWithTwoExampleInputs', 'NumberOfExampleInputs', 'SolvedState']
+__all__ = ['SOLVER_LIST', 'SolverInfo', 'load_solver', 'Solver', 'SolverWithTwoExampleInputs', 'NumberOfExampleInputs', 'SolvedState', 'InputMode']
 
 
 type Solver = Callable[
@@ -43,17 +31,49 @@ SOLVED: SolvedState = SolvedState.SOLVED
 UNSOLVED: SolvedState = SolvedState.UNSOLVED
 
 
-SOLVER_LIST: dict[int, tuple[str, Solver | SolverWithTwoExampleInputs, NumberOfExampleInputs, SolvedState]] = {
-    1:  ('Secret Entrance',     solve01, SINGLE,            SOLVED),
-    2:  ('Gift Shop',           solve02, SINGLE,            SOLVED),
-    3:  ('Lobby',               solve03, SINGLE,            SOLVED),
-    4:  ('Printing Department', solve04, SINGLE,            SOLVED),
-    5:  ('Cafeteria',           solve05, SINGLE,            SOLVED),
-    6:  ('Trash Compactor',     solve06, SINGLE,            SOLVED),
-    7:  ('Laboratories',        solve07, SINGLE,            SOLVED),
-    8:  ('Playground',          solve08, SINGLE,            SOLVED),
-    9:  ('Movie Theater',       solve09, SINGLE,            SOLVED),
-    10: ('Factory',             solve10, SINGLE,            UNSOLVED),
-    11: ('Reactor',             solve11, SEPARATE_EXAMPLES, SOLVED),
-    12: ('Christmas Tree Farm', solve12, SINGLE,            UNSOLVED)
+class InputMode(Enum):
+    STREAMING = 1    # one pass over the lines, memory does not grow with input size
+    WHOLE_INPUT = 2
+STREAMING: InputMode = InputMode.STREAMING
+WHOLE_INPUT: InputMode = InputMode.WHOLE_INPUT
+
+
+class SolverInfo:
+
+    __slots__ = ['title', 'module', 'example_inputs', 'state', 'input_mode', 'pure']
+
+    def __init__(self, title: str, module: str, *, example_inputs: NumberOfExampleInputs=SINGLE, state: SolvedState=SOLVED, input_mode: InputMode=WHOLE_INPUT, pure: bool=True) -> None:
+        self.title = title
+        self.module = module
+        self.example_inputs = example_inputs
+        self.state = state
+        self.input_mode = input_mode
+        self.pure = pure  # no state outlives a run and nothing is printed, safe to rerun in process and in shared workers
+
+    @property
+    def solved(self) -> bool:
+        return self.state == SOLVED
+
+    def __repr__(self) -> str:
+        return f'SolverInfo({self.title!r}, {self.module!r}, example_inputs={self.example_inputs.name}, state={self.state.name}, input_mode={self.input_mode.name}, pure={self.pure})'
+
+
+SOLVER_LIST: dict[int, SolverInfo] = {
+    1:  SolverInfo('Secret Entrance',     'day01', input_mode=STREAMING),
+    2:  SolverInfo('Gift Shop',           'day02'),
+    3:  SolverInfo('Lobby',               'day03', input_mode=STREAMING),
+    4:  SolverInfo('Printing Department', 'day04'),
+    5:  SolverInfo('Cafeteria',           'day05'),
+    6:  SolverInfo('Trash Compactor',     'day06'),
+    7:  SolverInfo('Laboratories',        'day07', input_mode=STREAMING),
+    8:  SolverInfo('Playground',          'day08'),
+    9:  SolverInfo('Movie Theater',       'day09'),
+    10: SolverInfo('Factory',             'day10', state=UNSOLVED, pure=False),  # prints progress per machine
+    11: SolverInfo('Reactor',             'day11', example_inputs=SEPARATE_EXAMPLES),
+    12: SolverInfo('Christmas Tree Farm', 'day12', state=UNSOLVED, pure=False)   # prints progress per region
 }
+
+
+def load_solver(day: int) -> Solver | SolverWithTwoExampleInputs:
+    module = importlib.import_module(f'.{SOLVER_LIST[day].module}', __package__)
+    return getattr(module, f'solve{day:02}')
@@ -0,0 +1,122 @@
+import json
+import os
+import platform
+import sqlite3
+import subprocess
+import time
+from importlib import metadata
+
+from .benchmark import BenchmarkResult
+from .memory import PROJECT_ROOT
+
+__all__ = ['StoredRun', 'record_run', 'find_run']
+
+
+HISTORY_PATH: str = 'cache/2025/history.sqlite3'
+SCHEMA_VERSION: int = 1
+SCHEMA: str = '''
+    CREATE TABLE IF NOT EXISTS runs (
+        id INTEGER PRIMARY KEY,
+        started REAL NOT NULL,
+        git_commit TEXT,
+        python_version TEXT NOT NULL,
+        numpy_version TEXT,
+        machine TEXT NOT NULL,
+        budget REAL NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS results (
+        run_id INTEGER NOT NULL REFERENCES runs(id),
+        day INTEGER NOT NULL,
+        minimum REAL NOT NULL,
+        median REAL NOT NULL,
+        p95 REAL NOT NULL,
+        stdev REAL NOT NULL,
+        rounds INTEGER NOT NULL,
+        rejected INTEGER NOT NULL,
+        iterations INTEGER NOT NULL,
+        times TEXT NOT NULL,
+        PRIMARY KEY (run_id, day)
+    );
+'''
+
+
+class StoredRun:
+
+    __slots__ = ['id', 'started', 'git_commit', 'python_version', 'numpy_version', 'machine', 'medians', 'times']
+
+    def __init__(self, *, id: int, started: float, git_commit: str | None, python_version: str, numpy_version: str | None, machine: str, medians: dict[int, float], times: dict[int, list[float]]) -> None:
+        self.id = id
+        self.started = started  # seconds since the epoch
+        self.git_commit = git_commit
+        self.python_version = python_version
+        self.numpy_version = numpy_version
+        self.machine = machine
+        self.medians = medians  # ms by day
+        self.times = times      # kept round times in ms by day
+
+    def describe(self) -> str:
+        when: str = time.strftime('%Y-%m-%d %H:%M', time.localtime(self.started))
+        return f'run {self.id} at {when}, commit {self.git_commit or "unknown"}, Python {self.python_version}, NumPy {self.numpy_version or "missing"}'
+
+
+def connect() -> sqlite3.Connection:
+    os.makedirs(os.path.dirname(HISTORY_PATH), exist_ok=True)
+    connection: sqlite3.Connection = sqlite3.connect(HISTORY_PATH)
+    (version,) = connection.execute('PRAGMA user_version').fetchone()
+    if version != SCHEMA_VERSION:
+        assert (version == 0), f'benchmark history {HISTORY_PATH} has unknown schema version {version}'
+        connection.executescript(SCHEMA)
+        connection.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+    return connection
+
+
+def git_commit() -> str | None:
+    try:
+        commit: str = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=PROJECT_ROOT, capture_output=True, text=True, check=True).stdout.strip()
+        dirty: str = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=PROJECT_ROOT, capture_output=True, text=True, check=True).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return f'{commit}-dirty' if dirty else commit
+
+
+def numpy_version() -> str | None:
+    try:
+        return metadata.version('numpy')  # read from package metadata, profiling need not import numpy
+    except metadata.PackageNotFoundError:
+        return None
+
+
+def record_run(results: dict[int, BenchmarkResult], budget: float) -> int:
+    with connect() as connection:
+        cursor: sqlite3.Cursor = connection.execute(
+            'INSERT INTO runs (started, git_commit, python_version, numpy_version, machine, budget) VALUES (?, ?, ?, ?, ?, ?)',
+            (time.time(), git_commit(), platform.python_version(), numpy_version(), f'{platform.system()} {platform.machine()}', budget))
+        run_id: int | None = cursor.lastrowid
+        assert (run_id is not None), 'benchmark run was not stored'
+        connection.executemany(
+            'INSERT INTO results (run_id, day, minimum, median, p95, stdev, rounds, rejected, iterations, times) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+            [(run_id, day, r.minimum, r.median, r.p95, r.stdev, r.rounds, r.rejected, r.iterations, json.dumps(r.times)) for day, r in results.items()])
+    connection.close()
+    return run_id
+
+
+def find_run(reference: str | None=None, before: int | None=None) -> StoredRun | None:
+    query: str = 'SELECT id, started, git_commit, python_version, numpy_version, machine FROM runs WHERE id < ?'
+    parameters: list[object] = [before if before is not None else 2 ** 62]
+    if reference is not None:
+        query += ' AND (git_commit LIKE ? OR CAST(id AS TEXT) = ?)'
+        parameters.extend([f'{reference}%', reference])
+    connection: sqlite3.Connection = connect()
+    try:
+        row = connection.execute(query + ' ORDER BY id DESC LIMIT 1', parameters).fetchone()
+        if row is None:
+            return None
+        run_id, started, commit, python_version, numpy_version, machine = row
+        medians: dict[int, float] = {}
+        times: dict[int, list[float]] = {}
+        for day, median, times_json in connection.execute('SELECT day, median, times FROM results WHERE run_id = ? ORDER BY day', (run_id,)):
+            medians[day] = median
+            times[day] = json.loads(times_json)
+    finally:
+        connection.close()
+    return StoredRun(id=run_id, started=started, git_commit=commit, python_version=python_version, numpy_version=numpy_version, machine=machine, medians=medians, times=times)
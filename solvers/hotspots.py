@@ -0,0 +1,149 @@
+import cProfile
+import os
+import pstats
+import sys
+import time
+from collections.abc import Callable
+from types import FrameType
+from typing import Any, cast
+
+from .days import *
+from .memory import PROJECT_ROOT
+from .profiling import pre_loaded_input
+from .solve import SolverError, describe_failure, get_solver_for, print_header
+from .limits import Limits, expect_runs
+
+__all__ = ['hotspots']
+
+
+HOTSPOTS_DIRECTORY: str = 'cache/2025/hotspots'
+TOP_FUNCTIONS: int = 15
+
+type FunctionKey = tuple[str, int, str]  # (filename, line, name) as used by pstats
+
+
+def relative_filename(filename: str) -> str:
+    if filename.startswith(PROJECT_ROOT + os.sep):
+        return os.path.relpath(filename, PROJECT_ROOT)
+    return os.path.basename(filename)
+
+
+def c_function_label(function: Any) -> str:
+    module: str | None = getattr(function, '__module__', None)
+    qualname: str = getattr(function, '__qualname__', repr(function))
+    return f'{module}.{qualname}' if module else qualname
+
+
+def collapsed_stacks(run: Callable[[], object]) -> tuple[dict[tuple[str, ...], int], dict[tuple[str, int], str]]:
+    stacks: dict[tuple[str, ...], int] = {}   # self time in ns by full call stack
+    qualnames: dict[tuple[str, int], str] = {}
+    stack: list[str] = []
+    last: int = time.perf_counter_ns()
+
+    def tracer(frame: FrameType, event: str, arg: Any) -> None:
+        nonlocal last
+        now: int = time.perf_counter_ns()
+        if stack:
+            key: tuple[str, ...] = tuple(stack)
+            stacks[key] = stacks.get(key, 0) + now - last
+        if event == 'call':
+            code = frame.f_code
+            qualnames[(code.co_filename, code.co_firstlineno)] = code.co_qualname
+            stack.append(f'{relative_filename(code.co_filename)}:{code.co_qualname}')
+        elif event == 'c_call':
+            stack.append(c_function_label(arg))
+        elif stack:
+            stack.pop()  # return, c_return and c_exception
+        last = time.perf_counter_ns()  # the tracer's own time is not charged to the solver
+
+    sys.setprofile(tracer)
+    try:
+        run()
+    finally:
+        sys.setprofile(None)
+    return stacks, qualnames
+
+
+def write_collapsed(path: str, stacks: dict[tuple[str, ...], int]) -> None:
+    with open(path, 'w') as file:
+        for stack, nanoseconds in sorted(stacks.items()):
+            microseconds: int = nanoseconds // 1000
+            if microseconds > 0:
+                file.write(f'{';'.join(stack)} {microseconds}\n')
+
+
+def function_label(key: FunctionKey, qualnames: dict[tuple[str, int], str]) -> str:
+    filename, line, name = key
+    if filename == '~':
+        return name  # built in, pstats already names it
+    return f'{qualnames.get((filename, line), name)} ({relative_filename(filename)}:{line})'
+
+
+def print_hotspot_table(heading: str, stats: dict[FunctionKey, tuple[int, int, float, float, Any]], order: int, total: float, qualnames: dict[tuple[str, int], str]) -> None:
+    print()
+    print(f'top {TOP_FUNCTIONS} functions by {heading}')
+    print()
+    print(f'|        Calls |        Self |  Cumulative | Share | Function |')
+    print(f'|--------------|-------------|-------------|-------|----------|')
+    ranked: list[tuple[FunctionKey, tuple[int, int, float, float, Any]]] = sorted(stats.items(), key=lambda item: item[1][order], reverse=True)
+    for key, (primitive_calls, calls, self_time, cumulative_time, _) in ranked[:TOP_FUNCTIONS]:
+        calls_str: str = f'{calls:,}' if calls == primitive_calls else f'{calls:,}/{primitive_calls:,}'
+        share: float = (self_time if order == 2 else cumulative_time) / total * 100.0 if total > 0 else 0.0
+        print(f'| {calls_str:>12} | {self_time * 1000.0:>8.3f} ms | {cumulative_time * 1000.0:>8.3f} ms | {share:>4.0f}% | {function_label(key, qualnames)} |')
+
+
+def hotspots_day(day: int) -> None:
+    _, _, solver = get_solver_for(day)
+    solver = cast(Solver, solver)
+    lines: list[str] = pre_loaded_input(day)
+
+    def run_solver() -> list[Any]:
+        expect_runs(1)
+        return list(solver(iter(lines)))
+
+    assert (len(run_solver()) == 2), f'solver for day {day} did not return 2 results in hotspots'
+
+    profiler: cProfile.Profile = cProfile.Profile()
+    profiler.runcall(run_solver)
+    stats: pstats.Stats = pstats.Stats(profiler)
+    stacks, qualnames = collapsed_stacks(run_solver)
+
+    os.makedirs(HOTSPOTS_DIRECTORY, exist_ok=True)
+    stats_path: str = os.path.join(HOTSPOTS_DIRECTORY, f'day{day:02}.pstats')
+    collapsed_path: str = os.path.join(HOTSPOTS_DIRECTORY, f'day{day:02}.folded')
+    stats.dump_stats(stats_path)
+    write_collapsed(collapsed_path, stacks)
+
+    function_stats = cast(dict[FunctionKey, tuple[int, int, float, float, Any]], getattr(stats, 'stats'))
+    function_stats = {key: value for key, value in function_stats.items() if '_lsprof.Profiler' not in key[2]}
+    total: float = cast(float, getattr(stats, 'total_tt'))
+    print(f'profiled {sum(calls for _, calls, _, _, _ in function_stats.values()):,} function calls in {total * 1000.0:.3f} ms (profiler overhead included)')
+    print_hotspot_table('cumulative time', function_stats, 3, total, qualnames)
+    print_hotspot_table('self time', function_stats, 2, total, qualnames)
+    print()
+    print(f'wrote {stats_path} and collapsed stacks to {collapsed_path}, e.g. flamegraph.pl {collapsed_path} > day{day:02}.svg')
+    sys.stdout.flush()
+
+
+def hotspots_reporting(day: int) -> str | None:
+    try:
+        hotspots_day(day)
+    except Exception as err:
+        return describe_failure(day, err)
+    return None
+
+
+def hotspots(day: int, limits: Limits | None=None) -> None:
+    day, info, _ = get_solver_for(day)
+    if not info.solved:
+        raise SolverError(f'solver for day {day} is not solved, cannot profile hotspots')
+    print_header(day, info.title)
+    print(f'profiling hot functions on pre-loaded input . . ')
+    print()
+    if limits is None:
+        hotspots_day(day)
+        return
+    from .supervise import run_supervised
+    error: str | None = run_supervised(hotspots_reporting, day, limits)
+    if error is not None:
+        raise SolverError(error)
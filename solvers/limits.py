@@ -0,0 +1,36 @@
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+
+__all__ = ['Limits', 'expect_runs', 'announcing_runs']
+
+
+class Limits:
+
+    __slots__ = ['timeout', 'memory']
+
+    def __init__(self, *, timeout: float | None=None, memory: int | None=None) -> None:
+        assert (timeout is None or timeout > 0), f'invalid timeout {timeout}'
+        assert (memory is None or memory > 0), f'invalid memory cap {memory}'
+        self.timeout = timeout  # seconds of wall-clock time per solver run
+        self.memory = memory    # MiB for the whole child process, interpreter included
+
+    def __repr__(self) -> str:
+        return f'Limits(timeout={self.timeout}, memory={self.memory})'
+
+
+__LISTENERS: list[Callable[[int], None]] = []
+
+
+def expect_runs(count: int) -> None:
+    # a supervisor counts its timeout per solver run, so tasks that run the solver many times say so first
+    if __LISTENERS:
+        __LISTENERS[-1](count)
+
+
+@contextmanager
+def announcing_runs(listener: Callable[[int], None]) -> Iterator[None]:
+    __LISTENERS.append(listener)
+    try:
+        yield
+    finally:
+        __LISTENERS.pop()
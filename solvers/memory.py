@@ -0,0 +1,71 @@
+import linecache
+import os
+import resource
+import sys
+import tracemalloc
+from collections.abc import Callable, Iterator
+from typing import Any
+
+__all__ = ['MemoryResult', 'trace_memory', 'format_bytes']
+
+
+TOP_LINES: int = 3
+TRACEBACK_FRAMES: int = 1
+PROJECT_ROOT: str = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class MemoryResult:
+
+    __slots__ = ['peak_traced', 'peak_rss', 'live_blocks', 'top_lines']
+
+    def __init__(self, *, peak_traced: int, peak_rss: int, live_blocks: int, top_lines: list[tuple[str, int, int]]) -> None:
+        self.peak_traced = peak_traced  # bytes
+        self.peak_rss = peak_rss        # bytes, whole process including interpreter and imports
+        self.live_blocks = live_blocks  # blocks still allocated by the solver at its final yield
+        self.top_lines = top_lines      # (location, bytes, blocks) at the final yield
+
+
+def peak_rss() -> int:
+    max_rss: int = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return max_rss if sys.platform == 'darwin' else max_rss * 1024  # macOS reports bytes, Linux KiB
+
+
+def location_of(frame: tracemalloc.Frame) -> str:
+    filename: str = frame.filename
+    if filename.startswith(PROJECT_ROOT + os.sep):
+        filename = os.path.relpath(filename, PROJECT_ROOT)
+    return f'{filename}:{frame.lineno}'
+
+
+def trace_memory(solver: Callable[[Iterator[str]], Iterator[Any]], lines: list[str]) -> MemoryResult:
+    tracemalloc.start(TRACEBACK_FRAMES)
+    try:
+        tracemalloc.reset_peak()
+        active_solver: Iterator[Any] = solver(iter(lines))
+        results: list[Any] = [result for _, result in zip(range(2), active_solver)]
+        assert (len(results) == 2), 'solver did not return 2 results in memory profile'
+        snapshot: tracemalloc.Snapshot = tracemalloc.take_snapshot()  # solver locals are still alive here
+        results.extend(active_solver)
+        assert (len(results) == 2), 'solver did not return 2 results in memory profile'
+        _, peak_traced = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    snapshot = snapshot.filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, linecache.__file__),
+        tracemalloc.Filter(False, __file__),
+    ))
+    statistics: list[tracemalloc.Statistic] = snapshot.statistics('lineno')
+    return MemoryResult(
+        peak_traced=peak_traced,
+        peak_rss=peak_rss(),
+        live_blocks=sum(stat.count for stat in statistics),
+        top_lines=[(location_of(stat.traceback[0]), stat.size, stat.count) for stat in statistics[:TOP_LINES]])
+
+
+def format_bytes(size: float) -> str:
+    for unit in ('B', 'KiB', 'MiB'):
+        if size < 1024:
+            return f'{size:.1f} {unit}'
+        size /= 1024
+    return f'{size:.1f} GiB'
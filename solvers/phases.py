@@ -0,0 +1,61 @@
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+__all__ = ['phase', 'PhaseRecorder', 'recording', 'PARSE', 'PREPROCESS', 'PART1', 'PART2']
+
+
+PARSE: str = 'parse'
+PREPROCESS: str = 'preprocess'
+PART1: str = 'Part 1'
+PART2: str = 'Part 2'
+
+
+class PhaseRecorder:
+
+    __slots__ = ['totals', 'current', 'since', 'provisional']
+
+    def __init__(self, first: str=PART1) -> None:
+        self.totals: dict[str, float] = {first: 0.0}
+        self.current: str | None = first
+        self.since: float = time.perf_counter()
+        self.provisional: bool = True  # first label gives way to the solver's own first marker
+
+    def mark(self, name: str) -> None:
+        now: float = time.perf_counter()
+        if self.provisional and self.current is not None:
+            self.totals = {name: self.totals.pop(self.current) + now - self.since}
+        elif self.current is not None:
+            self.totals[self.current] += now - self.since
+        if name not in self.totals:
+            self.totals[name] = 0.0
+        self.current = name
+        self.since = now
+        self.provisional = False
+
+    def pause(self) -> None:
+        if self.current is not None:
+            self.totals[self.current] += time.perf_counter() - self.since
+            self.current = None
+        self.provisional = False
+
+    def total(self) -> float:
+        return sum(self.totals.values())
+
+
+__ACTIVE: list[PhaseRecorder] = []
+
+
+def phase(name: str) -> None:
+    if __ACTIVE:
+        __ACTIVE[-1].mark(name)
+
+
+@contextmanager
+def recording(recorder: PhaseRecorder) -> Iterator[PhaseRecorder]:
+    __ACTIVE.append(recorder)
+    try:
+        yield recorder
+    finally:
+        recorder.pause()
+        __ACTIVE.pop()
@@ -0,0 +1,66 @@
+from collections.abc import Callable, Hashable
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any
+
+__all__ = ['RecoveringProcessPool', 'run_alone', 'crash_message']
+
+
+def crash_message(day: int) -> str:
+    return f'solver for day {day} crashed, its worker process died'
+
+
+def run_alone[T](call: Callable[[], T], crashed: str) -> T | str:
+    with ProcessPoolExecutor(max_workers=1, max_tasks_per_child=1) as executor:
+        try:
+            return executor.submit(call).result()
+        except BrokenProcessPool:
+            return crashed
+
+
+def finished_cleanly(future: Future[Any]) -> bool:
+    return future.done() and not future.cancelled() and not isinstance(future.exception(), BrokenProcessPool)
+
+
+class RecoveringProcessPool[K: Hashable, T]:
+
+    __slots__ = ['call_for', 'workers', 'fresh_processes', 'executor', 'futures']
+
+    def __init__(self, call_for: Callable[[K], Callable[[], T]], workers: int, fresh_processes: bool) -> None:
+        self.call_for = call_for  # must return something picklable, e.g. a partial of a module level function
+        self.workers = workers
+        self.fresh_processes = fresh_processes
+        self.executor: ProcessPoolExecutor = self.new_executor()
+        self.futures: dict[K, Future[T]] = {}
+
+    def new_executor(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(max_workers=self.workers, max_tasks_per_child=1 if self.fresh_processes else None)
+
+    def __len__(self) -> int:
+        return len(self.futures)
+
+    def submit(self, key: K) -> None:
+        assert (key not in self.futures), f'{key!r} is already submitted'
+        self.futures[key] = self.executor.submit(self.call_for(key))
+
+    def completed(self) -> list[K]:
+        done, _ = wait(self.futures.values(), return_when=FIRST_COMPLETED)
+        return [key for key, future in self.futures.items() if future in done]
+
+    def result(self, key: K, crashed: str) -> T | str:
+        future: Future[T] = self.futures.pop(key)
+        try:
+            return future.result()
+        except BrokenProcessPool:
+            pass
+        # a dying worker breaks everything in flight, so run this one by itself to tell whether it was the culprit
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        outcome: T | str = run_alone(self.call_for(key), crashed)
+        self.executor = self.new_executor()
+        for other, other_future in self.futures.items():
+            if not finished_cleanly(other_future):
+                self.futures[other] = self.executor.submit(self.call_for(other))
+        return outcome
+
+    def shutdown(self, cancel: bool=False) -> None:
+        self.executor.shutdown(wait=not cancel, cancel_futures=cancel)
@@ -0,0 +1,229 @@
+from functools import partial
+import statistics
+from typing import Any, Iterator, cast
+
+from printing.color import color_print, ASCII_RED, ASCII_YELLOW
+from .benchmark import BenchmarkResult, DEFAULT_BUDGET, benchmark, slower_p_value
+from .days import *
+from .history import StoredRun, find_run, record_run
+from .memory import MemoryResult, format_bytes, trace_memory
+from .phases import PhaseRecorder, recording, PART1, PART2
+from .solve import SolverError, describe_failure, get_solver_for, in_day_order, load_input_file, raise_for_failures, solved_days
+from .limits import Limits, expect_runs
+
+__all__ = ['profile', 'compare', 'memprofile']
+
+
+REGRESSION_P_VALUE: float = 0.01
+REGRESSION_RATIO: float = 1.10  # slowdowns smaller than this are not worth failing on
+STORED_MIN_ROUNDS: int = 12     # rounds run for every stored run, so outlier rejection leaves enough to compare
+COMPARE_MIN_ROUNDS: int = 8     # kept rounds needed on each side, fewer can never reach REGRESSION_P_VALUE
+PHASE_RUNS: int = 3             # recorded runs behind each phase median, the timing rounds already measured the total
+OVER_BUDGET_RATIO: float = 1.5  # timed rounds beyond this share of the budget are noted, calibration only aims for it
+
+
+def pre_loaded_input(day: int) -> list[str]:
+    with load_input_file(day, example=False) as file:
+        return [line.strip('\n') for line in file]
+
+
+def profile_single_pre_loaded(day: int, solver: Solver, budget: float=DEFAULT_BUDGET, min_rounds: int=STORED_MIN_ROUNDS) -> tuple[BenchmarkResult, dict[str, float]]:
+
+    lines: list[str] = pre_loaded_input(day)
+
+    expect_runs(1)
+    assert (len(list(solver(iter(lines)))) == 2), f'solver for day {day} did not return 2 results in profile'
+
+    def run_solver() -> list[Any]:
+        return list(solver(iter(lines)))
+
+    def run_null_solver() -> list[Any]:
+        return list(null_solver(iter(lines)))
+
+    result: BenchmarkResult = benchmark(run_solver, run_null_solver, budget, min_rounds)
+    return result, phase_breakdown(solver, lines, PHASE_RUNS)
+
+
+def phase_breakdown(solver: Solver, lines: list[str], repeats: int) -> dict[str, float]:
+    samples: dict[str, list[float]] = {}
+    for _ in range(repeats):
+        expect_runs(1)
+        recorder: PhaseRecorder = PhaseRecorder(PART1)
+        with recording(recorder):
+            active_solver = solver(iter(lines))
+            next(active_solver)
+            recorder.pause()
+            recorder.mark(PART2)
+            for _ in active_solver:
+                pass
+        for name, duration in recorder.totals.items():
+            samples.setdefault(name, []).append(duration * 1000.0)
+    return {name: statistics.median(durations) for name, durations in samples.items()}
+
+
+def null_solver(lines: Iterator[str]) -> Iterator[Any]:
+    yield None
+    yield None
+
+
+def align_decimal(value: float, leading_figures, decimal_places: int) -> str:
+    formatted = f'{value:.{decimal_places}f}'
+    actual_leading_figures = len(formatted) - 1 - decimal_places
+    assert (actual_leading_figures <= leading_figures), f'cannot format decimal {value} as specified'
+    return ' ' * (leading_figures - actual_leading_figures) + formatted
+
+
+PROFILE_TIME_COLUMNS: tuple[str, ...] = ('Min', 'Median', 'P95', 'Std Dev')
+
+
+def print_profile_header( max_title: int, leading_figures: int, decimal_places: int) -> None:
+    width: int = leading_figures + decimal_places + 4
+    print(f'profiling all solvers . . ')
+    print()
+    print(f'| Day | {'Title':<{max_title}} | {' | '.join(f'{column:>{width}}' for column in PROFILE_TIME_COLUMNS)} | Rounds | Samples Run |')
+    print(f'|-----|{'-' * (max_title + 2)}|{'|'.join('-' * (width + 2) for _ in PROFILE_TIME_COLUMNS)}|--------|-------------|')
+
+
+def print_profile_row(day: int, title: str, max_title: int, result: BenchmarkResult, leading_figures: int, decimal_places: int) -> None:
+    times: list[float] = [result.minimum, result.median, result.p95, result.stdev]
+    formatted: str = ' | '.join(f'{align_decimal(t, leading_figures, decimal_places)} ms' for t in times)
+    print(f'| {day:>3} | {title:<{max_title}} | {formatted} | {result.rounds:>6} | {result.samples:>11,} |')
+
+
+def print_phase_table(phases: dict[int, dict[str, float]], max_title: int) -> None:
+    if not phases:
+        return
+    print()
+    print(f'| Day | {'Title':<{max_title}} | Phases (median) |')
+    print(f'|-----|{'-' * (max_title + 2)}|-----------------|')
+    for day, totals in phases.items():
+        title: str = SOLVER_LIST[day].title
+        print(f'| {day:>3} | {title:<{max_title}} | {', '.join(f'{name} {duration:.3f} ms' for name, duration in totals.items())} |')
+
+
+def print_failure_row(day: int, title: str, max_title: int, failure: str) -> None:
+    color_print(f'| {day:>3} | {title:<{max_title}} | {failure} |', end='\n', flush=True, color=ASCII_RED)
+
+
+def timed_seconds(result: BenchmarkResult) -> float:
+    return result.samples * result.median / 1000.0
+
+
+def print_budget_notes(results: dict[int, BenchmarkResult], budget: float) -> None:
+    over_budget: list[int] = [day for day, result in results.items() if timed_seconds(result) > budget * OVER_BUDGET_RATIO]
+    if not over_budget:
+        return
+    print()
+    for day in over_budget:
+        result: BenchmarkResult = results[day]
+        color_print(f'note: day {day} ran {result.rounds + result.rejected} rounds taking {timed_seconds(result):.1f} sec, over the {budget:g} sec budget, as at least {STORED_MIN_ROUNDS} rounds always run', end='\n', flush=True, color=ASCII_YELLOW)
+
+
+def profile_day(day: int, budget: float=DEFAULT_BUDGET) -> tuple[BenchmarkResult, dict[str, float]] | str:
+    try:
+        day, info, solver = get_solver_for(day)
+        if not info.pure:
+            raise SolverError(f'solver for day {day} is not pure, cannot benchmark repeated runs in one process')
+        return profile_single_pre_loaded(day, cast(Solver, solver), budget)
+    except Exception as err:
+        return describe_failure(day, err)
+
+
+def profile_solved_days(jobs: int, budget: float, limits: Limits | None) -> tuple[dict[int, BenchmarkResult], dict[int, str]]:
+    max_title = max(len(info.title) for info in SOLVER_LIST.values())
+    print_profile_header(max_title, 9, 2)
+    results: dict[int, BenchmarkResult] = {}
+    failures: dict[int, str] = {}
+    phases: dict[int, dict[str, float]] = {}
+    for day, outcome in in_day_order(partial(profile_day, budget=budget), solved_days(), jobs, limits=limits):
+        if isinstance(outcome, str):
+            failures[day] = outcome
+            print_failure_row(day, SOLVER_LIST[day].title, max_title, outcome)
+            continue
+        results[day], phases[day] = outcome
+        title: str = SOLVER_LIST[day].title
+        print_profile_row(day, title, max_title, results[day], 9, 2)
+    print_phase_table(phases, max_title)
+    print_budget_notes(results, budget)
+    return results, failures
+
+
+def profile(jobs: int = 1, budget: float | None=None, limits: Limits | None=None) -> None:
+    if budget is None:
+        budget = DEFAULT_BUDGET
+    results, failures = profile_solved_days(jobs, budget, limits)
+    if results:
+        print()
+        print(f'stored as benchmark run {record_run(results, budget)}')
+    raise_for_failures(failures)
+
+
+def print_comparison_row(day: int, title: str, max_title: int, baseline: float, current: float, p_value: float, regressed: bool) -> None:
+    change: float = (current / baseline - 1.0) * 100.0 if baseline > 0 else 0.0
+    row: str = f'| {day:>3} | {title:<{max_title}} | {baseline:>10.3f} ms | {current:>10.3f} ms | {change:>+7.1f} % | {p_value:>7.4f} | {"SLOWER" if regressed else "":<6} |'
+    if regressed:
+        color_print(row, end='\n', flush=True, color=ASCII_RED)
+    else:
+        print(row)
+
+
+def compare(jobs: int = 1, budget: float | None=None, limits: Limits | None=None, reference: str | None=None) -> None:
+    if budget is None:
+        budget = DEFAULT_BUDGET
+    baseline: StoredRun | None = find_run(reference)
+    if baseline is None:
+        raise SolverError(f'no stored benchmark run {'matches ' + repr(reference) if reference is not None else 'to compare against'}, run profile first')
+    results, failures = profile_solved_days(jobs, budget, limits)
+    run_id: int = record_run(results, budget)
+    max_title = max(len(info.title) for info in SOLVER_LIST.values())
+    print()
+    print(f'comparing run {run_id} against baseline {baseline.describe()}')
+    print()
+    print(f'| Day | {'Title':<{max_title}} |      Baseline |       Current |    Change | p-value |        |')
+    print(f'|-----|{'-' * (max_title + 2)}|---------------|---------------|-----------|---------|--------|')
+    regressions: list[int] = []
+    for day, result in results.items():
+        if day not in baseline.times:
+            continue
+        if min(len(result.times), len(baseline.times[day])) < COMPARE_MIN_ROUNDS:
+            failures[day] = f'insufficient samples for day {day}: {len(result.times)} current and {len(baseline.times[day])} baseline rounds kept, {COMPARE_MIN_ROUNDS} needed on each side'
+            print_failure_row(day, SOLVER_LIST[day].title, max_title, failures[day])
+            continue
+        p_value: float = slower_p_value(result.times, baseline.times[day])
+        regressed: bool = p_value < REGRESSION_P_VALUE and result.median > baseline.medians[day] * REGRESSION_RATIO
+        if regressed:
+            regressions.append(day)
+        print_comparison_row(day, SOLVER_LIST[day].title, max_title, baseline.medians[day], result.median, p_value, regressed)
+    raise_for_failures(failures)
+    if regressions:
+        raise SolverError(f'{len(regressions)} solver(s) regressed, on day(s) {', '.join(str(day) for day in regressions)}')
+
+
+def memory_profile_day(day: int) -> MemoryResult | str:
+    try:
+        day, _, solver = get_solver_for(day)
+        return trace_memory(cast(Solver, solver), pre_loaded_input(day))
+    except Exception as err:
+        return describe_failure(day, err)
+
+
+def print_memory_row(day: int, title: str, max_title: int, result: MemoryResult) -> None:
+    top_lines: str = ', '.join(f'{location} ({format_bytes(size)})' for location, size, _ in result.top_lines)
+    print(f'| {day:>3} | {title:<{max_title}} | {format_bytes(result.peak_traced):>11} | {format_bytes(result.peak_rss):>11} | {result.live_blocks:>11,} | {top_lines} |')
+
+
+def memprofile(jobs: int = 1, limits: Limits | None=None) -> None:
+    max_title = max(len(info.title) for info in SOLVER_LIST.values())
+    print(f'memory profiling all solvers . . ')
+    print()
+    print(f'| Day | {'Title':<{max_title}} | Peak Traced |    Peak RSS | Live Blocks | Top Allocating Lines |')
+    print(f'|-----|{'-' * (max_title + 2)}|-------------|-------------|-------------|----------------------|')
+    failures: dict[int, str] = {}
+    for day, outcome in in_day_order(memory_profile_day, solved_days(), jobs, fresh_processes=True, limits=limits):
+        if isinstance(outcome, str):
+            failures[day] = outcome
+            print_failure_row(day, SOLVER_LIST[day].title, max_title, outcome)
+            continue
+        title: str = SOLVER_LIST[day].title
+        print_memory_row(day, title, max_title, outcome)
+    raise_for_failures(failures)
@@ -0,0 +1,89 @@
+import math
+import statistics
+from functools import partial
+from typing import Any, cast
+
+from printing.color import color_print, ASCII_RED
+from generators import GENERATOR_LIST, generate_input
+from .benchmark import BenchmarkResult, benchmark
+from .days import *
+from .profiling import null_solver
+from .solve import SolverError, get_solver_for, print_header
+from .limits import Limits, expect_runs
+
+__all__ = ['scale']
+
+
+SCALE_BUDGET: float = 0.5  # seconds of timed rounds per size
+SCALE_STEPS: tuple[int, ...] = tuple(range(-2, 8))  # doublings of input size relative to a typical input
+SCALE_TIME_LIMIT: float = 2000.0  # ms, largest projected median run worth timing
+
+
+def sweep_sizes(day: int) -> list[int]:
+    _, base_size, dimensions = GENERATOR_LIST[day]
+    sizes: list[int] = []
+    for step in SCALE_STEPS:
+        size: int = max(1, round(base_size * 2 ** (step / dimensions)))
+        if not sizes or size > sizes[-1]:
+            sizes.append(size)
+    return sizes
+
+
+def time_size(day: int, size: int, budget: float) -> tuple[int, BenchmarkResult]:
+    _, _, solver = get_solver_for(day)
+    solver = cast(Solver, solver)
+    lines: list[str] = generate_input(day, size)
+
+    expect_runs(1)
+    assert (len(list(solver(iter(lines)))) == 2), f'solver for day {day} did not return 2 results for size {size}'
+
+    def run_solver() -> list[Any]:
+        return list(solver(iter(lines)))
+
+    def run_null_solver() -> list[Any]:
+        return list(null_solver(iter(lines)))
+
+    return sum(len(line) + 1 for line in lines), benchmark(run_solver, run_null_solver, budget)
+
+
+def fit_exponent(input_bytes: list[int], medians: list[float]) -> float:
+    slope, _ = statistics.linear_regression([math.log(b) for b in input_bytes], [math.log(m) for m in medians])
+    return slope
+
+
+def scale(day: int, budget: float | None=None, limits: Limits | None=None) -> None:
+    if budget is None:
+        budget = SCALE_BUDGET
+    day, info, _ = get_solver_for(day)
+    if not info.solved:
+        raise SolverError(f'solver for day {day} is not solved, cannot scale')
+    if not info.pure:
+        raise SolverError(f'solver for day {day} is not pure, cannot benchmark repeated runs in one process')
+    if limits is not None:
+        from .supervise import run_supervised
+    print_header(day, info.title)
+    print(f'scaling solver over generated inputs . . ')
+    print()
+    print(f'|       Size |      Bytes |        Median |           P95 | Rounds | Exponent |')
+    print(f'|------------|------------|---------------|---------------|--------|----------|')
+    input_bytes: list[int] = []
+    medians: list[float] = []
+    for size in sweep_sizes(day):
+        task = partial(time_size, size=size, budget=budget)
+        outcome: tuple[int, BenchmarkResult] | str = task(day) if limits is None else run_supervised(task, day, limits)
+        if isinstance(outcome, str):
+            color_print(f'| {size:>10,} | {outcome} |', end='\n', flush=True, color=ASCII_RED)
+            break
+        size_bytes, result = outcome
+        median: float = max(result.median, 1e-6)  # overhead subtraction can leave nothing of a trivial run
+        local_exponent: float | None = fit_exponent(input_bytes[-1:] + [size_bytes], medians[-1:] + [median]) if medians else None
+        exponent: str = f'{local_exponent:>8.2f}' if local_exponent is not None else ' ' * 8
+        print(f'| {size:>10,} | {size_bytes:>10,} | {result.median:>10.3f} ms | {result.p95:>10.3f} ms | {result.rounds:>6} | {exponent} |', flush=True)
+        input_bytes.append(size_bytes)
+        medians.append(median)
+        if median * 2 ** max(1.0, local_exponent or 1.0) > SCALE_TIME_LIMIT:
+            break  # the next size doubles the input, projected past the time limit
+    print()
+    if len(medians) < 2:
+        raise SolverError(f'too few sizes timed for day {day} to fit a complexity exponent')
+    print(f'fitted complexity: time ~ bytes^{fit_exponent(input_bytes, medians):.2f} over {len(medians)} sizes')
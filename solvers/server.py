@@ -0,0 +1,175 @@
+import asyncio
+import json
+import os
+import signal
+from collections.abc import Awaitable, Callable
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from typing import Any
+
+from .days import *
+from .limits import Limits
+from .pools import crash_message
+from .solve import describe_failure, solve_input
+
+__all__ = ['serve', 'SOCKET_PATH']
+
+
+SOCKET_PATH: str = 'cache/2025/solver.sock'
+
+type Message = dict[str, Any]
+type Outcome = dict[str, Any] | str
+type SolveRequest = Callable[[int, str, str | None], Awaitable[Outcome]]
+
+
+def warm_solvers() -> None:
+    for day in SOLVER_LIST:
+        load_solver(day)
+
+
+class WorkerPool:
+
+    __slots__ = ['new_executor', 'workers', 'executor', 'replacing']
+
+    def __init__(self, workers: int, **options: Any) -> None:
+        self.new_executor: Callable[[], ProcessPoolExecutor] = partial(ProcessPoolExecutor, max_workers=workers, **options)
+        self.workers = workers
+        self.executor: ProcessPoolExecutor = self.new_executor()
+        self.replacing: asyncio.Lock = asyncio.Lock()
+
+    def start(self) -> None:
+        for future in [self.executor.submit(os.getpid) for _ in range(self.workers)]:
+            future.result()  # start workers now, so solver imports are not paid by the first requests
+
+    async def replace(self, broken: ProcessPoolExecutor) -> None:
+        async with self.replacing:
+            if self.executor is not broken:
+                return  # another request already replaced it
+            broken.shutdown(wait=False, cancel_futures=True)
+            self.executor = self.new_executor()
+            await asyncio.to_thread(self.start)
+
+    async def run[T](self, call: Callable[[], T], crashed: str) -> T | str:
+        for _ in range(2):  # the worker that died may have been running another request, so retry once
+            executor: ProcessPoolExecutor = self.executor
+            try:
+                return await asyncio.wrap_future(executor.submit(call))
+            except BrokenProcessPool:
+                await self.replace(executor)
+        return crashed
+
+    def shutdown(self) -> None:
+        self.executor.shutdown(cancel_futures=True)
+
+
+def answer_messages(record: dict[str, Any]) -> list[Message]:
+    return [
+        {'day': record['day'], 'part': 1, 'answer': record['part1'], 'time': record['part1_time']},
+        {'day': record['day'], 'part': 2, 'answer': record['part2'], 'time': record['part2_time']},
+        {'day': record['day'], 'done': True, 'time': record['time'], 'phases': record['phases']}]
+
+
+def parse_request(line: bytes) -> tuple[Any, int, str, str | None]:
+    request: Any = json.loads(line)
+    if not isinstance(request, dict):
+        raise ValueError('request is not a JSON object')
+    day: Any = request.get('day')
+    input_path: Any = request.get('input')
+    example_b_path: Any = request.get('example_b')
+    if not isinstance(day, int) or not isinstance(input_path, str) or not isinstance(example_b_path, str | None):
+        raise ValueError("expected integer 'day', string 'input' and optional string 'example_b'")
+    return request.get('id'), day, input_path, example_b_path
+
+
+def pooled_solving(warm: WorkerPool, fresh: WorkerPool) -> SolveRequest:
+    async def solve_request(day: int, input_path: str, example_b_path: str | None) -> Outcome:
+        pure: bool = SOLVER_LIST[day].pure if day in SOLVER_LIST else True
+        return await (warm if pure else fresh).run(partial(solve_input, day, input_path, example_b_path), crash_message(day))
+    return solve_request
+
+
+def supervised_solving(supervisors: ThreadPoolExecutor, limits: Limits) -> SolveRequest:
+    from .supervise import run_supervised
+
+    async def solve_request(day: int, input_path: str, example_b_path: str | None) -> Outcome:
+        task: Callable[[int], Outcome] = partial(solve_input, input_path=input_path, example_b_path=example_b_path)
+        return await asyncio.wrap_future(supervisors.submit(run_supervised, task, day, limits))
+    return solve_request
+
+
+async def handle_connection(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, solve_request: SolveRequest) -> None:
+    write_lock: asyncio.Lock = asyncio.Lock()
+    pending: set[asyncio.Task[None]] = set()
+
+    async def send(message: Message) -> None:
+        async with write_lock:
+            writer.write(json.dumps(message, default=str).encode() + b'\n')
+            await writer.drain()
+
+    async def handle_request(line: bytes) -> None:
+        request_id: Any = None
+        try:
+            request_id, day, input_path, example_b_path = parse_request(line)
+        except ValueError as err:
+            await send({'id': request_id, 'error': f'bad request: {err}'})
+            return
+        try:
+            outcome: Outcome = await solve_request(day, input_path, example_b_path)
+        except Exception as err:  # the pool itself failed in a way it cannot recover from
+            outcome = describe_failure(day, err)
+        if isinstance(outcome, str):
+            await send({'id': request_id, 'day': day, 'error': outcome})
+            return
+        for message in answer_messages(outcome):
+            await send({'id': request_id} | message)
+
+    try:
+        while line := await reader.readline():
+            if line.strip():
+                task: asyncio.Task[None] = asyncio.create_task(handle_request(line))  # requests on one connection run concurrently
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+        if pending:
+            await asyncio.gather(*pending)
+    except ConnectionError:
+        pass  # client went away, its outstanding answers have nowhere to go
+    finally:
+        writer.close()
+
+
+async def serve_until_terminated(socket_path: str, solve_request: SolveRequest) -> None:
+    terminated: asyncio.Event = asyncio.Event()
+    for signal_number in (signal.SIGINT, signal.SIGTERM):
+        asyncio.get_running_loop().add_signal_handler(signal_number, terminated.set)
+    server: asyncio.Server = await asyncio.start_unix_server(lambda reader, writer: handle_connection(reader, writer, solve_request), path=socket_path)
+    async with server:
+        await terminated.wait()
+        server.close_clients()  # otherwise leaving waits for every client to hang up
+
+
+def serve(socket_path: str | None=None, jobs: int = 1, limits: Limits | None=None) -> None:
+    if socket_path is None:
+        socket_path = SOCKET_PATH
+    if os.path.dirname(socket_path):
+        os.makedirs(os.path.dirname(socket_path), exist_ok=True)
+    if os.path.exists(socket_path):
+        os.remove(socket_path)  # left behind by a server that did not shut down cleanly
+    try:
+        if limits is not None:
+            with ThreadPoolExecutor(max_workers=jobs) as supervisors:  # each thread supervises a fresh child per request
+                print(f'{jobs} supervised worker(s) serving solve requests on {socket_path} . . ', end='\n', flush=True)
+                asyncio.run(serve_until_terminated(socket_path, supervised_solving(supervisors, limits)))
+            return
+        warm: WorkerPool = WorkerPool(jobs, initializer=warm_solvers)
+        fresh: WorkerPool = WorkerPool(jobs, max_tasks_per_child=1)  # impure solvers get a new worker per request
+        try:
+            warm.start()
+            print(f'{jobs} worker(s) serving solve requests on {socket_path} . . ', end='\n', flush=True)
+            asyncio.run(serve_until_terminated(socket_path, pooled_solving(warm, fresh)))
+        finally:
+            warm.shutdown()
+            fresh.shutdown()
+    finally:
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
@@ -1,12 +1,17 @@
+import sys
+from collections.abc import Callable, Iterator
+from contextlib import nullcontext, redirect_stdout
 from functools import partial
-from io import TextIOWrapper
-import time
-from typing import TextIO, cast
+from io import StringIO, TextIOWrapper
+from typing import Any, TextIO, cast
 
-from printing.color import color_print, ASCII_YELLOW
+from printing.color import color_print, ASCII_CYAN, ASCII_RED, ASCII_YELLOW
+from .cache import cache_key, load_answers, store_answers
 from .days import *
+from .phases import PhaseRecorder, recording, PART1, PART2
+from .limits import Limits
 
-__all__ = ['SolverError', 'solve_all', 'solve', 'profile']
+__all__ = ['SolverError', 'solve_all', 'solve', 'Limits']
 
 
 class SolverError(Exception):
@@ -15,15 +20,14 @@ class SolverError(Exception):
         super().__init__(*args)
 
 
-def get_solver_for(day: int | None=None) -> tuple[int, str, Solver | SolverWithTwoExampleInputs, NumberOfExampleInputs, SolvedState]:
+def get_solver_for(day: int | None=None) -> tuple[int, SolverInfo, Solver | SolverWithTwoExampleInputs]:
     if not SOLVER_LIST:
         raise SolverError('no solvers found')
     if day is None:
         day = max(SOLVER_LIST)
     if day not in SOLVER_LIST:
         raise SolverError(f'no solver for day {day}')
-    title, solver, has_example_b, is_solved = SOLVER_LIST[day]
-    return day, title, solver, has_example_b, is_solved
+    return day, SOLVER_LIST[day], load_solver(day)
 
 
 def print_header(day: int, title: str, example: bool=False) -> None:
@@ -33,61 +37,232 @@ def print_header(day: int, title: str, example: bool=False) -> None:
         color_print(f'currently using example input file', color=ASCII_YELLOW)
 
 
-def load_input_file(day: int | None=None, example: bool=False, example_b: bool=False) -> TextIOWrapper:
+def input_filename(day: int | None=None, example: bool=False, example_b: bool=False) -> str:
     if not example:
         assert (not example_b), f'cannot load example b, if not using example'
     if not example_b:
-        filename = f'input/2025/{"example" if example else "input"}{day:02}.txt'
-    else:
-        filename = f'input/2025/example{day:02}b.txt'
+        return f'input/2025/{"example" if example else "input"}{day:02}.txt'
+    return f'input/2025/example{day:02}b.txt'
+
+
+def load_input_file(day: int | None=None, example: bool=False, example_b: bool=False) -> TextIOWrapper:
+    filename: str = input_filename(day, example, example_b)
     try:
         return open(filename)
     except FileNotFoundError:
         raise SolverError(f'missing input file {filename}')
 
 
-def solve_all() -> None:
-    for day, (_, _, _, solved_state) in SOLVER_LIST.items():
-        if solved_state == SolvedState.SOLVED:
+def solved_days() -> list[int]:
+    return [day for day, info in sorted(SOLVER_LIST.items()) if info.solved]
+
+
+def in_process_pool[T](task: Callable[[int], T], days: list[int], workers: int, fresh_processes: bool) -> Iterator[tuple[int, T | str]]:
+    from .pools import RecoveringProcessPool, crash_message  # deferred, only worth its import time when running a pool
+    pool: RecoveringProcessPool[int, T] = RecoveringProcessPool(lambda day: partial(task, day), workers, fresh_processes)
+    try:
+        for day in days:
+            pool.submit(day)
+        for day in days:
+            yield day, pool.result(day, crash_message(day))
+    except BaseException:
+        pool.shutdown(cancel=True)
+        raise
+    pool.shutdown()
+
+
+def in_day_order[T](task: Callable[[int], T], days: list[int], jobs: int, fresh_processes: bool=False, limits: Limits | None=None) -> Iterator[tuple[int, T | str]]:
+    fresh_processes = fresh_processes or not all(SOLVER_LIST[day].pure for day in days)  # impure solvers never share a worker
+    if jobs <= 1 and not fresh_processes and limits is None:
+        for day in days:
+            yield day, task(day)
+        return
+    workers: int = max(1, min(jobs, len(days)))
+    if limits is None:
+        yield from in_process_pool(task, days, workers, fresh_processes)
+        return
+    from concurrent.futures import Future, ThreadPoolExecutor  # deferred, only worth its import time when running a pool
+    from .supervise import run_supervised
+    executor: ThreadPoolExecutor = ThreadPoolExecutor(max_workers=workers)  # each thread supervises its own child process
+    futures: list[Future[T | str]] = [executor.submit(run_supervised, task, day, limits) for day in days]
+    try:
+        for day, future in zip(days, futures):
+            yield day, future.result()
+    except BaseException:
+        executor.shutdown(wait=False, cancel_futures=True)
+        raise
+    executor.shutdown()
+
+
+def describe_failure(day: int, err: Exception) -> str:
+    if isinstance(err, SolverError):
+        return str(err)
+    if isinstance(err, MemoryError):
+        return f'OOM: solver for day {day} ran out of memory'
+    return f'solver for day {day} raised {type(err).__name__}: {err}'
+
+
+def solve_reporting(day: int, example: bool=False, use_cache: bool=True, limits: Limits | None=None) -> str | None:
+    try:
+        solve(day, example=example, use_cache=use_cache, limits=limits)
+    except Exception as err:
+        return describe_failure(day, err)
+    return None
+
+
+def solve_captured(day: int, use_cache: bool=True) -> tuple[str, str | None]:
+    output: StringIO = StringIO()
+    with redirect_stdout(output):
+        error: str | None = solve_reporting(day, use_cache=use_cache)
+    return output.getvalue(), error
+
+
+def raise_for_failures(failures: dict[int, str]) -> None:
+    if failures:
+        raise SolverError(f'{len(failures)} solver(s) failed, on day(s) {', '.join(str(day) for day in failures)}')
+
+
+def solve_all(jobs: int = 1, use_cache: bool=True, limits: Limits | None=None) -> None:
+    failures: dict[int, str] = {}
+    if jobs <= 1:
+        for day in solved_days():
+            print(flush=True)
+            error: str | None = solve_reporting(day, use_cache=use_cache, limits=limits)
+            if error is not None:
+                failures[day] = error
+                color_print(error, end='\n', flush=True, color=ASCII_RED)
+    else:
+        for day, outcome in in_day_order(partial(solve_captured, use_cache=use_cache), solved_days(), jobs, limits=limits):
+            output, error = ('', outcome) if isinstance(outcome, str) else outcome
             print()
-            solve(day, example=False)
+            print(output, end='', flush=True)
+            if error is not None:
+                failures[day] = error
+                color_print(error, end='\n', flush=True, color=ASCII_RED)
+    raise_for_failures(failures)
+
+
+def read_lines(path: str) -> list[str]:
+    with open(path) as file:
+        return [line.strip('\n') for line in file]
+
+
+def solve_input(day: int, input_path: str, example_b_path: str | None=None) -> dict[str, Any] | str:
+    try:
+        day, info, solver = get_solver_for(day)
+        if example_b_path is not None and info.example_inputs != NumberOfExampleInputs.SEPARATE_EXAMPLES:
+            raise SolverError(f'solver for day {day} takes a single input')
+        lines_b: list[str] | None = read_lines(example_b_path) if example_b_path is not None else None
+        with open(input_path) as file:
+            lines: Iterator[str] = (line.strip('\n') for line in file)
+            if info.input_mode == InputMode.WHOLE_INPUT:
+                lines = iter(list(lines))  # read before timing starts, the solver holds all of it anyway
+            recorder: PhaseRecorder = PhaseRecorder(PART1)
+            with recording(recorder):
+                if lines_b is not None:
+                    active_solver = cast(SolverWithTwoExampleInputs, solver)(lines, iter(lines_b))
+                else:
+                    active_solver = cast(Solver, solver)(lines)
+                try:
+                    part1 = next(active_solver)
+                    recorder.pause()
+                    part1_time: float = recorder.total()
+                    recorder.mark(PART2)
+                    part2 = next(active_solver)
+                except StopIteration:
+                    raise SolverError(f'solver for day {day} yielded too few results')
+            try:
+                next(active_solver)
+                raise SolverError(f'solver for day {day} yielded too many results')
+            except StopIteration:
+                pass
+    except Exception as err:
+        return describe_failure(day, err)
+    return {'day': day, 'part1': part1, 'part2': part2, 'part1_time': part1_time, 'part2_time': recorder.total() - part1_time, 'time': recorder.total(), 'phases': recorder.totals}
+
+
+def print_phases(totals: dict[str, float], print_result: Callable[..., None]) -> None:
+    width: int = max(len(name) for name in totals)
+    for name, duration in totals.items():
+        print(f'  {name:<{width}} : ', end='', flush=True)
+        print_result(f'{duration:.6f} sec', end='\n', flush=True)
 
 
-def solve(day: int | None=None, example: bool=False) -> None:
-    day, title, solver, number_of_example_inputs, _ = get_solver_for(day)
-    use_example_b: bool = example and number_of_example_inputs == NumberOfExampleInputs.SEPARATE_EXAMPLES
-    print_header(day, title, example)
+def lookup_cached(day: int, example: bool, use_example_b: bool, solver: Callable[..., Any]) -> tuple[str | None, tuple[Any, Any, float] | None]:
+    input_paths: list[str] = [input_filename(day, example)]
+    if use_example_b:
+        input_paths.append(input_filename(day, example, True))
+    try:
+        key: str = cache_key(day, example, input_paths, solver)
+    except FileNotFoundError:
+        return None, None  # missing input is reported when the solver loads it
+    return key, load_answers(key)
+
+
+def print_cached(answers: tuple[Any, Any, float], print_result: Callable[..., None]) -> None:
+    part1, part2, time_taken = answers
+    for label, value in (('Part 1: ', part1), ('Part 2: ', part2), ('Time : ', f'{time_taken:.6f} sec')):
+        print(label, end='', flush=True)
+        print_result(value, end='', flush=True)
+        color_print(' (cached)', end='\n', flush=True, color=ASCII_CYAN)
+
+
+def solve(day: int | None=None, example: bool=False, use_cache: bool=True, limits: Limits | None=None, from_stdin: bool=False) -> None:
+    assert (not (from_stdin and (example or limits is not None))), 'stdin input is only read in this process, and never as example'
+    if limits is not None:
+        from .supervise import run_supervised  # deferred, multiprocessing is slow to import and only needed under limits
+        task = partial(solve_reporting, example=example, use_cache=use_cache)
+        error: str | None = run_supervised(task, day if day is not None else max(SOLVER_LIST), limits)
+        if error is not None:
+            raise SolverError(error)
+        return
+    day, info, solver = get_solver_for(day)
+    use_example_b: bool = example and info.example_inputs == NumberOfExampleInputs.SEPARATE_EXAMPLES
+    print_header(day, info.title, example)
+    if from_stdin:
+        color_print(f'reading input from stdin', color=ASCII_YELLOW)
+    print_result = partial(color_print, color=ASCII_YELLOW) if example else print
+    key: str | None = None
+    if use_cache and not from_stdin:
+        key, cached = lookup_cached(day, example, use_example_b, solver)
+        if cached is not None:
+            print_cached(cached, print_result)
+            return
     try:
         example_b_file: TextIO | None = None
         if use_example_b:
             example_b_file = load_input_file(day, example, True)
-        with load_input_file(day, example) as file:
+        with nullcontext(sys.stdin) if from_stdin else load_input_file(day, example) as file:
 
+            lines: Iterator[str] = (line.strip('\n') for line in file)
+            if from_stdin and info.input_mode == InputMode.WHOLE_INPUT:
+                lines = iter(list(lines))  # drain the pipe before timing, the solver holds all of it anyway
             if example_b_file is not None:
                 solver = cast(SolverWithTwoExampleInputs, solver)
-                active_solver = solver((line.strip('\n') for line in file), (line.strip('\n') for line in example_b_file))
+                active_solver = solver(lines, (line.strip('\n') for line in example_b_file))
             else:
                 solver = cast(Solver, solver)
-                active_solver = solver((line.strip('\n') for line in file))
+                active_solver = solver(lines)
             if not hasattr(active_solver, '__next__'):
                 raise SolverError(f'solver for day {day} did not yield any results')
 
-            print_result = partial(color_print, color=ASCII_YELLOW) if example else print
+            recorder: PhaseRecorder = PhaseRecorder(PART1)
+            with recording(recorder):
 
-            start: float = time.perf_counter()
+                part1 = next(active_solver)
+                recorder.pause()
+                print('Part 1: ', end='', flush=True)
+                print_result(part1, end='\n', flush=True)
 
-            part1 = next(active_solver)
-            print('Part 1: ', end='', flush=True)
-            print_result(part1, end='\n', flush=True)
-
-            part2 = next(active_solver)
-            print('Part 2: ', end='', flush=True)
-            print_result(part2, end='\n', flush=True)
-
-            single_time: float = time.perf_counter() - start
+                recorder.mark(PART2)
+                part2 = next(active_solver)
+                recorder.pause()
+                print('Part 2: ', end='', flush=True)
+                print_result(part2, end='\n', flush=True)
 
             print('Time : ', end='', flush=True)
-            print_result(f'{single_time:.6f} sec', end='\n', flush=True)
+            print_result(f'{recorder.total():.6f} sec', end='\n', flush=True)
+            print_phases(recorder.totals, print_result)
 
             try:
                 next(active_solver)
@@ -98,81 +273,11 @@ def solve(day: int | None=None, example: bool=False) -> None:
             except StopIteration:
                 pass
 
+            if key is not None:
+                store_answers(key, part1, part2, recorder.total())
+
     except StopIteration:
         if example_b_file is not None:
             example_b_file.close()
             example_b_file = None
         raise SolverError(f'solver for day {day} yielded too few results')
-
-
-def samples_for_single_time(single_time: float) -> int:
-    if single_time > 1:
-        return 3
-    if single_time > 0.1:
-        return 30
-    if single_time > 0.01:
-        return 300
-    if single_time > 0.001:
-        return 3000
-    if single_time > 0.0_001:
-        return 30_000
-    if single_time > 0.00_001:
-        return 300_000
-    if single_time > 0.000_001:
-        return 3_000_000
-    if single_time > 0.0_000_001:
-        return 30_000_000
-    return 300_000_000
-
-
-def profile_single_pre_loaded(day: int, solver: Solver) -> tuple[float, int]:
-
-    with load_input_file(day, example=False) as file:
-        lines = [line.strip('\n') for line in file]
-
-    # warm up run
-    _ = list(solver(iter(lines)))
-
-    # run once to determine sample count
-    start: float = time.perf_counter()
-    _ = list(solver(iter(lines)))
-    single_time = time.perf_counter() - start
-    samples: int = samples_for_single_time(single_time)
-
-    # profiling
-    start = time.perf_counter()
-    for _ in range(samples):
-        active_solver = solver(iter(lines))
-        assert (len(list(active_solver)) == 2), f'solver for day {day} did not return 2 results in profile'
-    average_time: float = (time.perf_counter() - start) / samples
-    return average_time * 1000.0, samples
-
-
-def align_decimal(value: float, leading_figures, decimal_places: int) -> str:
-    formatted = f'{value:.{decimal_places}f}'
-    actual_leading_figures = len(formatted) - 1 - decimal_places
-    assert (actual_leading_figures <= leading_figures), f'cannot format decimal {value} as specified'
-    return ' ' * (leading_figures - actual_leading_figures) + formatted
-
-
-def print_profile_header( max_title: int, leading_figures: int, decimal_places: int) -> None:
-    print(f'profiling all solvers . . ')
-    print()
-    print(f'| Day | {'Title':<{max_title}} | {'Runtime':>{leading_figures + decimal_places + 4}} | Samples Run |')
-    print(f'|-----|{'-' * (max_title + 2)}|{'-' * (leading_figures + decimal_places + 5 + 1)}|-------------|')
-
-
-def print_profile_row(day: int, title: str, max_title: int, average_time: float, samples: int, leading_figures: int, decimal_places: int) -> None:
-    print(f'| {day:>3} | {title:<{max_title}} | {align_decimal(average_time, leading_figures, decimal_places)} ms | {samples:>11,} |')
-
-
-def profile() -> None:
-    max_title = max(len(title) for title, _, _, is_solved in SOLVER_LIST.values())
-    print_profile_header(max_title, 9, 2)
-    for day in sorted(SOLVER_LIST.keys()):
-        day, title, solver, _, is_solved = get_solver_for(day)
-        if is_solved == SolvedState.UNSOLVED:
-            continue
-        solver = cast(Solver, solver)
-        average_time, samples = profile_single_pre_loaded(day, solver)
-        print_profile_row(day, title, max_title, average_time, samples, 9, 2)
@@ -0,0 +1,82 @@
+import multiprocessing
+import os
+import signal
+import sys
+import threading
+import time
+from collections.abc import Callable
+from multiprocessing.connection import Connection
+from typing import Any
+
+from .limits import Limits, announcing_runs
+from .memory import peak_rss
+
+__all__ = ['Limits', 'run_supervised']
+
+
+WATCHDOG_INTERVAL: float = 0.05  # seconds between peak RSS checks in the child
+MIB: int = 1024 * 1024
+
+
+def watch_rss(connection: Connection, lock: threading.Lock, memory_bytes: int) -> None:
+    while peak_rss() <= memory_bytes:
+        time.sleep(WATCHDOG_INTERVAL)
+    with lock:
+        connection.send(('oom', None))
+    os._exit(1)
+
+
+def child_main(connection: Connection, task: Callable[[int], Any], day: int, memory: int | None) -> None:
+    lock: threading.Lock = threading.Lock()
+    if memory is not None:
+        # watch resident memory rather than capping address space, which counts mappings that are never touched
+        threading.Thread(target=watch_rss, args=(connection, lock, memory * MIB), daemon=True).start()
+
+    def announce(count: int) -> None:
+        with lock:
+            connection.send(('runs', count))
+
+    try:
+        with announcing_runs(announce):
+            result: Any = task(day)
+    except MemoryError:
+        with lock:
+            connection.send(('oom', None))
+        return
+    sys.stdout.flush()  # output of a serial run goes straight to the inherited stdout
+    with lock:
+        connection.send(('ok', result))
+
+
+def run_supervised[T](task: Callable[[int], T], day: int, limits: Limits) -> T | str:
+    context = multiprocessing.get_context('spawn')
+    receiver, sender = context.Pipe(duplex=False)
+    process = context.Process(target=child_main, args=(sender, task, day, limits.memory), daemon=True)
+    process.start()
+    sender.close()
+    try:
+        deadline: float | None = None if limits.timeout is None else time.monotonic() + limits.timeout
+        while True:
+            if not receiver.poll(None if deadline is None else max(0.0, deadline - time.monotonic())):
+                process.kill()
+                return f'TIMEOUT: solver for day {day} exceeded {limits.timeout:g} sec budget'
+            try:
+                status, value = receiver.recv()
+            except EOFError:
+                process.join()
+                if limits.memory is not None and process.exitcode == -signal.SIGKILL:
+                    return f'OOM: solver for day {day} was killed, memory cap is {limits.memory} MiB'
+                return f'solver for day {day} crashed with exit code {process.exitcode}'
+            if status != 'runs':
+                break
+            if limits.timeout is not None:
+                deadline = time.monotonic() + value * limits.timeout  # the budget is per run, starting afresh for each batch
+        if status == 'oom':
+            return f'OOM: solver for day {day} exceeded {limits.memory} MiB memory cap'
+        return value
+    except BaseException:
+        process.kill()
+        raise
+    finally:
+        process.join()
+        receiver.close()
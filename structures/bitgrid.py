@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+from typing import Any
+
+import numpy as np
+
+from structures.grid import Grid, NEIGHBOUR_OFFSETS, ORTHOGONAL_OFFSETS
+from structures.points import Dimensions, Point
+
+
+WORD_BITS: int = 64
+WORD: np.dtype = np.dtype('<u8')  # bit x of a row is bit x % 64 of word x // 64
+COUNT_BITS: int = 4  # neighbour counts go up to 8
+
+
+class BitGrid:
+
+    words: np.ndarray
+    dimensions: Dimensions
+
+    def __init__(self, words: np.ndarray, dimensions: Dimensions) -> None:
+        assert (words.dtype == WORD and words.shape == (dimensions.height, -(-dimensions.width // WORD_BITS))), f'{words.dtype} words of shape {words.shape} do not fit {dimensions}'
+        self.words = words
+        self.dimensions = dimensions
+
+    @staticmethod
+    def blank(dimensions: Dimensions) -> BitGrid:
+        return BitGrid(np.zeros((dimensions.height, -(-dimensions.width // WORD_BITS)), dtype=WORD), dimensions)
+
+    @staticmethod
+    def from_mask(mask: np.ndarray) -> BitGrid:
+        assert (mask.ndim == 2), f'mask of shape {mask.shape} is not two dimensional'
+        height, width = mask.shape
+        num_words: int = -(-width // WORD_BITS)
+        padded: np.ndarray = np.zeros((height, num_words * WORD_BITS), dtype=np.bool_)
+        padded[:, :width] = mask
+        words: np.ndarray = np.packbits(padded, axis=1, bitorder='little').view(WORD)
+        return BitGrid(words, Dimensions(width=width, height=height))
+
+    @staticmethod
+    def from_grid(grid: Grid, symbol: str) -> BitGrid:
+        try:
+            number: int = grid.symbols.index(symbol)
+        except ValueError:
+            raise AssertionError(f'unexpected symbol populating bits: {symbol!r}')
+        return BitGrid.from_mask(grid.cells == number)
+
+    def to_mask(self) -> np.ndarray:
+        return np.unpackbits(self.words.view(np.uint8), axis=1, count=self.dimensions.width, bitorder='little').view(np.bool_)
+
+    def to_grid(self, symbols: tuple[str, ...] | list[str] | str, symbol: str) -> Grid:
+        grid: Grid = Grid.blank(self.dimensions, symbols)
+        try:
+            number: int = grid.symbols.index(symbol)
+        except ValueError:
+            raise AssertionError(f'unexpected symbol populating cells: {symbol!r}')
+        grid.cells[self.to_mask()] = number
+        return grid
+
+    def __str__(self) -> str:
+        return '\n'.join(''.join('#' if bit else '.' for bit in row) for row in self.to_mask().tolist())
+
+    def __repr__(self) -> str:
+        return f'BitGrid({self.words!r}, {self.dimensions!r})'
+
+    def __getitem__(self, point: Point) -> bool:
+        assert type(point) == Point and point in self.dimensions
+        return bool((int(self.words[point.y, point.x // WORD_BITS]) >> (point.x % WORD_BITS)) & 1)
+
+    def __setitem__(self, point: Point, value: bool) -> None:
+        assert type(point) == Point and point in self.dimensions
+        bit: np.ndarray = np.array(1 << (point.x % WORD_BITS), dtype=WORD)
+        if value:
+            self.words[point.y, point.x // WORD_BITS] |= bit
+        else:
+            self.words[point.y, point.x // WORD_BITS] &= ~bit
+
+    def __eq__(self, other: Any) -> bool:
+        return (type(other) == BitGrid
+                and self.dimensions == other.dimensions
+                and np.array_equal(self.words, other.words))
+
+    def copy(self) -> BitGrid:
+        return BitGrid(self.words.copy(), self.dimensions)
+
+    def count(self) -> int:
+        return int(np.bitwise_count(self.words).sum(dtype=np.int64))
+
+    def __check_compatible(self, other: BitGrid) -> None:
+        assert (type(other) == BitGrid), f'cannot combine BitGrid with {type(other).__name__}'
+        assert (self.dimensions == other.dimensions), f'cannot combine {self.dimensions} and {other.dimensions} bit grids'
+
+    def __and__(self, other: BitGrid) -> BitGrid:
+        self.__check_compatible(other)
+        return BitGrid(self.words & other.words, self.dimensions)
+
+    def __or__(self, other: BitGrid) -> BitGrid:
+        self.__check_compatible(other)
+        return BitGrid(self.words | other.words, self.dimensions)
+
+    def __xor__(self, other: BitGrid) -> BitGrid:
+        self.__check_compatible(other)
+        return BitGrid(self.words ^ other.words, self.dimensions)
+
+    def __invert__(self) -> BitGrid:
+        return BitGrid(self.__without_padding(~self.words), self.dimensions)
+
+    def and_not(self, other: BitGrid) -> BitGrid:
+        self.__check_compatible(other)
+        return BitGrid(self.words & ~other.words, self.dimensions)
+
+    def __without_padding(self, words: np.ndarray) -> np.ndarray:
+        spare: int = -self.dimensions.width % WORD_BITS
+        if spare:
+            words[:, -1] &= np.array((1 << (WORD_BITS - spare)) - 1, dtype=WORD)
+        return words
+
+    def __shifted_words(self, dx: int, dy: int) -> np.ndarray:
+        height, num_words = self.words.shape
+        rv: np.ndarray = np.zeros_like(self.words)
+        if abs(dy) >= height or abs(dx) >= self.dimensions.width:
+            return rv
+        rv[max(dy, 0):height + min(dy, 0)] = self.words[max(-dy, 0):height - max(dy, 0)]
+        word_shift, bit_shift = divmod(abs(dx), WORD_BITS)
+        if word_shift:
+            if dx > 0:
+                rv[:, word_shift:] = rv[:, :num_words - word_shift].copy()
+                rv[:, :word_shift] = 0
+            else:
+                rv[:, :num_words - word_shift] = rv[:, word_shift:].copy()
+                rv[:, num_words - word_shift:] = 0
+        if bit_shift:
+            carried: np.ndarray = np.zeros_like(rv)
+            if dx > 0:  # towards larger x, which is towards more significant bits
+                carried[:, 1:] = rv[:, :-1] >> np.uint64(WORD_BITS - bit_shift)
+                rv <<= np.uint64(bit_shift)
+            else:
+                carried[:, :-1] = rv[:, 1:] << np.uint64(WORD_BITS - bit_shift)
+                rv >>= np.uint64(bit_shift)
+            rv |= carried
+        return self.__without_padding(rv)
+
+    def shift(self, dx: int, dy: int) -> BitGrid:
+        return BitGrid(self.__shifted_words(dx, dy), self.dimensions)
+
+    def __neighbour_count_planes(self, diagonals: bool) -> list[np.ndarray]:
+        planes: list[np.ndarray] = [np.zeros_like(self.words) for _ in range(COUNT_BITS)]
+        for dy, dx in NEIGHBOUR_OFFSETS if diagonals else ORTHOGONAL_OFFSETS:
+            carry: np.ndarray = self.__shifted_words(-dx, -dy)
+            for plane in planes:  # ripple-carry add of one bit into every cell's counter at once
+                sum_bits: np.ndarray = plane ^ carry
+                carry &= plane
+                plane[...] = sum_bits
+        return planes
+
+    def neighbour_counts(self, diagonals: bool = True) -> np.ndarray:
+        counts: np.ndarray = np.zeros((self.dimensions.height, self.dimensions.width), dtype=np.uint8)
+        for bit, plane in enumerate(self.__neighbour_count_planes(diagonals)):
+            counts |= BitGrid(plane, self.dimensions).to_mask().view(np.uint8) << bit
+        return counts
+
+    def with_fewer_neighbours(self, threshold: int, diagonals: bool = True) -> BitGrid:
+        assert (0 <= threshold < 1 << COUNT_BITS), f'neighbour threshold {threshold} out of range'
+        less: np.ndarray = np.zeros_like(self.words)
+        equal: np.ndarray = ~less
+        for bit, plane in reversed(list(enumerate(self.__neighbour_count_planes(diagonals)))):
+            if (threshold >> bit) & 1:
+                less |= equal & ~plane
+                equal &= plane
+            else:
+                equal &= ~plane
+        return BitGrid(self.words & less, self.dimensions)
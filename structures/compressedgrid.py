@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+import numpy as np
+
+from structures.grid import Grid
+from structures.points import Dimensions, Point
+
+
+class CompressedGrid:
+
+    grid: Grid
+    xs: np.ndarray       # column i covers real x in [xs[i], xs[i + 1])
+    ys: np.ndarray       # row j covers real y in [ys[j], ys[j + 1])
+    widths: np.ndarray
+    heights: np.ndarray
+
+    def __init__(self, grid: Grid, xs: np.ndarray, ys: np.ndarray) -> None:
+        assert (grid.cells.shape == (len(ys) - 1, len(xs) - 1)), f'{grid.dimensions} grid does not fit {len(xs)} x and {len(ys)} y breakpoints'
+        self.grid = grid
+        self.xs = xs
+        self.ys = ys
+        self.widths = np.diff(xs)
+        self.heights = np.diff(ys)
+
+    @staticmethod
+    def from_points(xs: Sequence[int] | np.ndarray, ys: Sequence[int] | np.ndarray, symbols: tuple[str, ...] | list[str] | str) -> CompressedGrid:
+        real_xs: np.ndarray = np.asarray(xs, dtype=np.int64)
+        real_ys: np.ndarray = np.asarray(ys, dtype=np.int64)
+        assert (len(real_xs) > 0 and len(real_xs) == len(real_ys)), f'{len(real_xs)} xs and {len(real_ys)} ys do not make points'
+        x_breaks: np.ndarray = np.unique(np.concatenate((real_xs, real_xs + 1)))  # every point gets a one wide column of its own
+        y_breaks: np.ndarray = np.unique(np.concatenate((real_ys, real_ys + 1)))
+        grid: Grid = Grid.blank(Dimensions(width=len(x_breaks) - 1, height=len(y_breaks) - 1), symbols)
+        return CompressedGrid(grid, x_breaks, y_breaks)
+
+    def __str__(self) -> str:
+        return str(self.grid)
+
+    def __repr__(self) -> str:
+        return f'CompressedGrid({self.grid!r}, {self.xs!r}, {self.ys!r})'
+
+    def compress(self, xs: Sequence[int] | np.ndarray, ys: Sequence[int] | np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        columns: np.ndarray = np.searchsorted(self.xs, xs, side='right') - 1
+        rows: np.ndarray = np.searchsorted(self.ys, ys, side='right') - 1
+        assert (np.all((columns >= 0) & (columns < len(self.widths)))), 'x outside of compressed grid'
+        assert (np.all((rows >= 0) & (rows < len(self.heights)))), 'y outside of compressed grid'
+        return columns, rows
+
+    def compress_points(self, points: Sequence[Point]) -> list[Point]:
+        columns, rows = self.compress([point.x for point in points], [point.y for point in points])
+        return [Point(x=x, y=y) for x, y in zip(columns.tolist(), rows.tolist())]
+
+    def real_point(self, point: Point) -> Point:
+        assert point in self.grid.dimensions
+        return Point(x=int(self.xs[point.x]), y=int(self.ys[point.y]))
+
+    def cell_areas(self) -> np.ndarray:
+        return np.outer(self.heights, self.widths)
+
+    def area(self, p1: Point, p2: Point) -> int:
+        assert p1 in self.grid.dimensions and p2 in self.grid.dimensions
+        left, right = min(p1.x, p2.x), max(p1.x, p2.x)
+        top, bottom = min(p1.y, p2.y), max(p1.y, p2.y)
+        return int(self.xs[right + 1] - self.xs[left]) * int(self.ys[bottom + 1] - self.ys[top])
+
+    def real_area_of(self, symbol: str, p1: Point | None = None, p2: Point | None = None) -> int:
+        try:
+            number: int = self.grid.symbols.index(symbol)
+        except ValueError:
+            raise AssertionError(f'unexpected symbol in area: {symbol!r}')
+        if p1 is None or p2 is None:
+            p1, p2 = Point(x=0, y=0), Point(x=self.grid.dimensions.width - 1, y=self.grid.dimensions.height - 1)
+        assert p1 in self.grid.dimensions and p2 in self.grid.dimensions
+        left, right = min(p1.x, p2.x), max(p1.x, p2.x) + 1
+        top, bottom = min(p1.y, p2.y), max(p1.y, p2.y) + 1
+        matching: np.ndarray = self.grid.cells[top:bottom, left:right] == number
+        return int(self.heights[top:bottom] @ matching @ self.widths[left:right])
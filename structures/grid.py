@@ -1,83 +1,151 @@
 from __future__ import annotations
 
-from collections import deque
-from collections.abc import Iterable
+import hashlib
+from collections.abc import Iterable, Sequence
 
 import numpy as np
-from typing import TextIO, Any, Iterator
+from typing import TextIO, Any, Iterator, cast
 
 from structures.points import Dimensions, Point
 
 
+NEIGHBOUR_OFFSETS: tuple[tuple[int, int], ...] = ((-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1))
+ORTHOGONAL_OFFSETS: tuple[tuple[int, int], ...] = ((-1, 0), (0, -1), (0, 1), (1, 0))
+
+BLOCK_CELLS: int = 1 << 24  # cells scanned at a time, bounds the temporary masks over memory-mapped grids
+
+type Coordinates = tuple[np.ndarray, np.ndarray]  # (ys, xs) index arrays as returned by np.nonzero
+
+
+def checked_symbols(symbols: tuple[str, ...] | list[str] | str) -> tuple[str, ...]:
+    num_symbols: int = len(symbols)
+    assert (num_symbols >= 2), 'too few symbols'
+    assert (num_symbols <= 256), 'too many symbols'
+    assert (len(set(symbols)) == num_symbols), 'duplicate in symbols'
+    assert ('\n' not in symbols), 'symbols contains new line character'
+    if type(symbols) != tuple:
+        symbols = tuple(symbols)
+    assert type(symbols) == tuple
+    for symbol in symbols:
+        assert (type(symbol) == str and len(symbol) == 1), f'invalid symbol: {symbol!r}'
+    return symbols
+
+
+def is_immutable(cells: np.ndarray) -> bool:
+    owner: Any = cells
+    while isinstance(owner, np.ndarray):
+        if owner.flags.writeable:
+            return False  # a read-only view of a writable array still changes
+        owner = owner.base
+    if owner is None:
+        return True
+    try:
+        return memoryview(owner).readonly  # e.g. bytes, or a read-only memory map
+    except TypeError:
+        return False
+
+
+class SummedAreaTable:
+
+    sums: np.ndarray
+
+    def __init__(self, mask: np.ndarray) -> None:
+        assert (mask.ndim == 2), f'mask of shape {mask.shape} is not two dimensional'
+        height, width = mask.shape
+        self.sums = np.zeros((height + 1, width + 1), dtype=np.int64)
+        np.cumsum(np.cumsum(mask, axis=0, dtype=np.int64), axis=1, out=self.sums[1:, 1:])
+
+    def counts(self, x1: np.ndarray, y1: np.ndarray, x2: np.ndarray, y2: np.ndarray) -> np.ndarray:
+        left, right = np.minimum(x1, x2), np.maximum(x1, x2) + 1
+        top, bottom = np.minimum(y1, y2), np.maximum(y1, y2) + 1
+        return self.sums[bottom, right] - self.sums[top, right] - self.sums[bottom, left] + self.sums[top, left]
+
+    def count(self, p1: Point, p2: Point) -> int:
+        return int(self.counts(np.array(p1.x), np.array(p1.y), np.array(p2.x), np.array(p2.y)))
+
+    def is_full(self, p1: Point, p2: Point) -> bool:
+        return self.count(p1, p2) == (abs(p1.x - p2.x) + 1) * (abs(p1.y - p2.y) + 1)
+
+
 class Grid:
 
     cells: np.ndarray
     dimensions: Dimensions
     symbols: tuple[str, ...]
+    summed_area_tables: dict[int, SummedAreaTable]
 
     def __init__(self, cells: np.ndarray, dimensions: Dimensions, symbols: tuple[str, ...]) -> None:
         self.cells = cells
         self.dimensions = dimensions
         self.symbols = symbols
+        self.summed_area_tables = {}
 
     @staticmethod
     def blank(dimensions: Dimensions, symbols: tuple[str, ...] | list[str] | str) -> Grid:
-        num_symbols: int = len(symbols)
-        assert (num_symbols >= 2), 'too few symbols'
-        assert (num_symbols <= 256), 'too many symbols'
-        assert (len(set(symbols)) == num_symbols), 'duplicate in symbols'
-        assert ('\n' not in symbols), 'symbols contains new line character'
-        if type(symbols) != tuple:
-            symbols = tuple(symbols)
-        assert type(symbols) == tuple
-        for symbol in symbols:
-            assert (type(symbol) == str and len(symbol) == 1), f'invalid symbol: {symbol!r}'
+        symbols = checked_symbols(symbols)
         return Grid(np.zeros([dimensions.height, dimensions.width], dtype=np.uint8), dimensions, symbols)
 
+    @staticmethod
+    def create_mapped(path: str, dimensions: Dimensions, symbols: tuple[str, ...] | list[str] | str) -> Grid:
+        symbols = checked_symbols(symbols)
+        cells: np.memmap = np.lib.format.open_memmap(path, mode='w+', dtype=np.uint8, shape=(dimensions.height, dimensions.width))
+        return Grid(cells, dimensions, symbols)
+
+    @staticmethod
+    def open_mapped(path: str, symbols: tuple[str, ...] | list[str] | str, writable: bool = True) -> Grid:
+        symbols = checked_symbols(symbols)
+        cells: np.memmap = np.lib.format.open_memmap(path, mode='r+' if writable else 'r')
+        assert (cells.dtype == np.uint8 and cells.ndim == 2), f'{path} holds {cells.dtype} cells of shape {cells.shape}, not a grid'
+        height, width = cells.shape
+        return Grid(cells, Dimensions(width=width, height=height), symbols)
+
+    def flush(self) -> None:
+        if isinstance(self.cells, np.memmap):
+            self.cells.flush()
+
     @staticmethod
     def parse(file: Iterator[str], symbols: tuple[str, ...] | list[str] | str, unique: str | None = None) -> tuple[Grid, Point | None]:
+        symbols = checked_symbols(symbols)
         num_symbols: int = len(symbols)
-        assert (num_symbols >= 2), 'too few symbols'
-        assert (num_symbols <= 256), 'too many symbols'
-        assert (len(set(symbols)) == num_symbols), 'duplicate in symbols'
-        assert ('\n' not in symbols), 'symbols contains new line character'
-        if type(symbols) != tuple:
-            symbols = tuple(symbols)
-        assert type(symbols) == tuple
         for symbol in symbols:
-            assert (type(symbol) == str and len(symbol) == 1), f'invalid symbol: {symbol!r}'
+            assert (ord(symbol) < 256), f'symbol {symbol!r} does not fit in a byte'
         if unique is not None:
             assert (unique in symbols), f'unique symbol {unique!r} no in symbol list'
-        unique_location = None
         rows: list[str] = []
-        num_cols: int | None = None
         for line in file:
             line = line.strip('\n')
             if not line:
                 break
-            for symbol in line:
-                assert (symbol in symbols), f'unexpected symbol: {symbol!r}'
             rows.append(line)
-            if num_cols is not None:
-                assert (len(line) == num_cols), ''
-            num_cols = len(line)
         num_rows: int = len(rows)
-        assert num_rows > 0 and num_cols is not None and num_cols > 0
-        cells = np.zeros((num_rows, num_cols), dtype=np.uint8)
+        assert num_rows > 0, 'no rows in grid'
+        num_cols: int = len(rows[0])
+        assert num_cols > 0, 'empty first row in grid'
+        for row in rows:
+            assert (len(row) == num_cols), f'row of length {len(row)} in grid of width {num_cols}'
+        try:
+            raw: np.ndarray = np.frombuffer(''.join(rows).encode('latin-1'), dtype=np.uint8).reshape((num_rows, num_cols))
+        except UnicodeEncodeError as err:
+            raise AssertionError(f'unexpected symbol: {err.object[err.start]!r}')
+        symbol_bytes: np.ndarray = np.frombuffer(''.join(symbols).encode('latin-1'), dtype=np.uint8)
+        lookup: np.ndarray = np.zeros(256, dtype=np.uint8)
+        lookup[symbol_bytes] = np.arange(num_symbols)
+        valid: np.ndarray = np.zeros(256, dtype=np.bool_)
+        valid[symbol_bytes] = True
+        invalid: np.ndarray = ~valid[raw]
+        if invalid.any():
+            y, x = np.argwhere(invalid)[0]
+            raise AssertionError(f'unexpected symbol: {rows[y][x]!r}')
+        cells: np.ndarray = lookup[raw]
         assert type(cells) == np.ndarray and len(cells.shape) == 2 and cells.dtype == np.uint8
-        assert cells.shape[0] > 0 and cells.shape[1] > 0
-        for y, row in enumerate(rows):
-            for x, symbol in enumerate(row):
-                try:
-                    if symbol == unique:
-                        if unique_location is not None:
-                            raise AssertionError(f'unique symbol {unique!r} is not unique')
-                        unique_location = Point(x=x, y=y)
-                    cells[y, x] = symbols.index(symbol)
-                except ValueError:
-                    raise AssertionError(f'unexpected symbol populating cells: {symbol!r}')
-        if unique is not None and unique_location is None:
-            raise AssertionError(f'did not find unique symbol {unique!r}')
+        unique_location: Point | None = None
+        if unique is not None:
+            found: np.ndarray = np.argwhere(cells == symbols.index(unique))
+            if len(found) == 0:
+                raise AssertionError(f'did not find unique symbol {unique!r}')
+            if len(found) > 1:
+                raise AssertionError(f'unique symbol {unique!r} is not unique')
+            unique_location = Point(x=int(found[0, 1]), y=int(found[0, 0]))
         return Grid(cells, Dimensions(width=num_cols, height=num_rows), symbols), unique_location
 
     def __str__(self) -> str:
@@ -102,15 +170,36 @@ class Grid:
             number: int = self.symbols.index(symbol)
         except ValueError:
             raise AssertionError(f'unexpected symbol populating cells: {symbol!r}')
+        self.invalidate()
         self.cells[point.y, point.x] = number
 
     def __eq__(self, other: Any) -> bool:
         return (type(other) == Grid
                 and self.symbols == other.symbols
                 and self.dimensions == other.dimensions
-                and self.cells.dtype is self.cells.dtype
+                and self.cells.dtype == other.cells.dtype
                 and np.array_equal(self.cells, other.cells))
 
+    def invalidate(self) -> None:
+        self.summed_area_tables.clear()  # call after writing to cells directly
+
+    def summed_area_table(self, symbol: str) -> SummedAreaTable:
+        try:
+            number: int = self.symbols.index(symbol)
+        except ValueError:
+            raise AssertionError(f'unexpected symbol in summed area table: {symbol!r}')
+        if number not in self.summed_area_tables:
+            self.summed_area_tables[number] = SummedAreaTable(self.cells == number)
+        return self.summed_area_tables[number]
+
+    def count_in_rectangle(self, symbol: str, p1: Point, p2: Point) -> int:
+        assert p1 in self.dimensions and p2 in self.dimensions
+        return self.summed_area_table(symbol).count(p1, p2)
+
+    def rectangle_is_all(self, symbol: str, p1: Point, p2: Point) -> bool:
+        assert p1 in self.dimensions and p2 in self.dimensions
+        return self.summed_area_table(symbol).is_full(p1, p2)
+
     def copy(self) -> Grid:
         return Grid(self.cells.copy(), self.dimensions, self.symbols)
 
@@ -136,10 +225,11 @@ class Grid:
             new_number: int = self.symbols.index(new)
         except ValueError:
             raise AssertionError(f'unexpected symbol populating cells: {new!r}')
-        for y in range(self.dimensions.height):
-            for x in range(self.dimensions.width):
-                if self.cells[y, x] == old_number:
-                    self.cells[y, x] = new_number
+        self.invalidate()
+        rows_per_block: int = max(1, BLOCK_CELLS // self.cells.shape[1])
+        for top in range(0, self.cells.shape[0], rows_per_block):
+            block: np.ndarray = self.cells[top:top + rows_per_block]
+            block[block == old_number] = new_number
 
     def count_neighbours(self, point: Point, symbol: str) -> int:
         if point not in self.dimensions:
@@ -193,105 +283,144 @@ class Grid:
                 rv += 1
         return rv
 
-    def locations_of(self, symbol: str) -> list[Point]:
+    def neighbour_counts(self, symbol: str, diagonals: bool = True) -> np.ndarray:
+        height, width = self.cells.shape
+        try:
+            number: int = self.symbols.index(symbol)
+        except ValueError:
+            return np.zeros((height, width), dtype=np.uint8)
+        padded: np.ndarray = np.pad(self.cells == number, 1).view(np.uint8)
+        offsets: tuple[tuple[int, int], ...] = NEIGHBOUR_OFFSETS if diagonals else ORTHOGONAL_OFFSETS
+        counts: np.ndarray = np.zeros((height, width), dtype=np.uint8)
+        for dy, dx in offsets:
+            counts += padded[1 + dy:1 + dy + height, 1 + dx:1 + dx + width]
+        return counts
+
+    def mask_with_fewer_neighbours(self, symbol: str, threshold: int, diagonals: bool = True) -> np.ndarray:
         try:
             number: int = self.symbols.index(symbol)
         except ValueError:
             raise AssertionError(f'unexpected symbol populating cells: {symbol!r}')
-        rv: list[Point] = []
-        for y in range(self.dimensions.height):
-            for x in range(self.dimensions.width):
-                if self.cells[y, x] == number:
-                    rv.append(Point(x=x, y=y))
-        return rv
+        return (self.cells == number) & (self.neighbour_counts(symbol, diagonals) < threshold)
 
-    def set_all(self, points: Iterable[Point], symbol: str) -> None:
+    def coordinates_of(self, symbol: str) -> Coordinates:
         try:
             number: int = self.symbols.index(symbol)
         except ValueError:
             raise AssertionError(f'unexpected symbol populating cells: {symbol!r}')
-        for point in points:
+        ys, xs = np.nonzero(self.cells == number)
+        return ys, xs
+
+    def locations_of(self, symbol: str) -> list[Point]:
+        ys, xs = self.coordinates_of(symbol)
+        return [Point(x=x, y=y) for y, x in zip(ys.tolist(), xs.tolist())]
+
+    def set_all(self, points: Iterable[Point] | Coordinates, symbol: str) -> None:
+        try:
+            number: int = self.symbols.index(symbol)
+        except ValueError:
+            raise AssertionError(f'unexpected symbol populating cells: {symbol!r}')
+        self.invalidate()
+        if isinstance(points, tuple) and len(points) == 2 and all(isinstance(axis, np.ndarray) for axis in points):
+            ys, xs = cast(Coordinates, points)
+            self.cells[ys, xs] = number
+            return
+        for point in cast(Iterable[Point], points):
             self.cells[point.y, point.x] = number
 
     def flood_fill(self, start: Point, symbol: str) -> int:
         try:
-            number: np.int8 = np.int8(self.symbols.index(symbol))
+            number: int = self.symbols.index(symbol)
         except ValueError:
             raise AssertionError(f'unexpected symbol in flood fill: {symbol!r}')
-        current: np.int8 = np.int8(self.cells[start.y, start.x])
+        current: int = int(self.cells[start.y, start.x])
         if current == number:
             return 0
-        queue: deque[tuple[int, int]] = deque([(start.y, start.x)])
+        self.invalidate()
         height, width = self.cells.shape
+        seeds: list[tuple[int, int]] = [(start.y, start.x)]
         area: int = 0
-        while queue:
-            y, x = queue.popleft()
-            if self.cells[y, x] == current:
-                self.cells[y, x] = number
-                area += 1
-                if y - 1 >= 0:
-                    if self.cells[(y-1, x)] == current:
-                        queue.append((y-1, x))
-                if x - 1 >= 0:
-                    if self.cells[(y, x-1)] == current:
-                        queue.append((y, x-1))
-                if y + 1 < height:
-                    if self.cells[(y+1, x)] == current:
-                        queue.append((y+1, x))
-                if x + 1 < width:
-                    if self.cells[(y, x+1)] == current:
-                        queue.append((y, x+1))
+        while seeds:
+            y, x = seeds.pop()
+            row: np.ndarray = self.cells[y]
+            if row[x] != current:
+                continue
+            blocked: np.ndarray = row[x::-1] != current
+            offset: int = int(np.argmax(blocked))
+            left: int = x - offset + 1 if blocked[offset] else 0
+            blocked = row[x:] != current
+            offset = int(np.argmax(blocked))
+            right: int = x + offset if blocked[offset] else width
+            row[left:right] = number
+            area += right - left
+            for next_y in (y - 1, y + 1):
+                if 0 <= next_y < height:
+                    span: np.ndarray = self.cells[next_y, left:right] == current
+                    span_starts: np.ndarray = np.flatnonzero(span & ~np.concatenate(([False], span[:-1])))
+                    seeds.extend((next_y, left + span_start) for span_start in span_starts.tolist())
         return area
 
-    def __draw_horizontal_ortholine(self, x1: int, x2: int, y: int, number: int) -> None:
-        if x2 < x1:
-            x1, x2 = x2, x1
-        for x in range(x1, x2 + 1):
-            self.cells[y, x] = number
-
-    def __draw_vertical_ortholine(self, x: int, y1: int, y2: int, number: int) -> None:
-        if y2 < y1:
-            y1, y2 = y2, y1
-        for y in range(y1, y2 + 1):
-            self.cells[y, x] = number
-
-    def draw_ortholine(self, start: Point, end: Point, symbol: str) -> None:
+    def label_components(self, symbol: str) -> tuple[np.ndarray, np.ndarray]:
         try:
             number: int = self.symbols.index(symbol)
         except ValueError:
-            raise AssertionError(f'unexpected symbol in flood fill: {symbol!r}')
+            raise AssertionError(f'unexpected symbol in labelling: {symbol!r}')
+        mask: np.ndarray = self.cells == number
+        run_starts: np.ndarray = mask.copy()
+        run_starts[:, 1:] &= ~mask[:, :-1]
+        runs: np.ndarray = np.cumsum(run_starts.reshape(-1), dtype=np.int64).reshape(mask.shape) - 1
+        num_runs: int = int(np.count_nonzero(run_starts))
+        overlaps: np.ndarray = mask[:-1] & mask[1:]
+        overlaps[:, 1:] &= ~overlaps[:, :-1]  # one link per overlap of two runs
+        upper: np.ndarray = runs[:-1][overlaps]
+        lower: np.ndarray = runs[1:][overlaps]
+        parent: np.ndarray = np.arange(num_runs, dtype=np.int64)
+        while True:
+            upper_roots, lower_roots = parent[upper], parent[lower]
+            merging: np.ndarray = upper_roots != lower_roots
+            if not merging.any():
+                break
+            np.minimum.at(parent, np.maximum(upper_roots, lower_roots)[merging], np.minimum(upper_roots, lower_roots)[merging])
+            while not np.array_equal(grandparent := parent[parent], parent):
+                parent = grandparent  # every tree merges with a neighbour per round, so rounds are logarithmic
+        run_labels: np.ndarray = np.cumsum(parent == np.arange(num_runs), dtype=np.int32)[parent]
+        labels: np.ndarray = np.zeros(mask.shape, dtype=np.int32)
+        labels[mask] = run_labels[runs[mask]]
+        areas: np.ndarray = np.bincount(labels.reshape(-1), minlength=1)
+        areas[0] = 0
+        return labels, areas
+
+    def __ortholine_cells(self, start: Point, end: Point, exclusive: bool) -> np.ndarray:
+        assert start in self.dimensions and end in self.dimensions
+        trim: int = 1 if exclusive else 0
         if start.x == end.x:
-            self.__draw_vertical_ortholine(start.x, start.y, end.y, number)
-        elif start.y == end.y:
-            self.__draw_horizontal_ortholine(start.x, end.x, start.y, number)
-        else:
-            raise AssertionError('line is not ortholine')
-
-    def __draw_horizontal_ortholine_exclusive_no_overlap(self, x1: int, x2: int, y: int, number: np.uint8) -> None:
-        if x2 < x1:
-            x1, x2 = x2, x1
-        for x in range(x1 + 1, x2):
-            assert self.cells[y, x] != number
-            self.cells[y, x] = number
-
-    def __draw_vertical_ortholine_exclusive_no_overlap(self, x: int, y1: int, y2: int, number: np.uint8) -> None:
-        if y2 < y1:
-            y1, y2 = y2, y1
-        for y in range(y1 + 1, y2):
-            assert self.cells[y, x] != number
-            self.cells[y, x] = number
+            top, bottom = min(start.y, end.y), max(start.y, end.y)
+            return self.cells[top + trim:bottom + 1 - trim, start.x]
+        if start.y == end.y:
+            left, right = min(start.x, end.x), max(start.x, end.x)
+            return self.cells[start.y, left + trim:right + 1 - trim]
+        raise AssertionError('line is not ortholine')
+
+    def draw_ortholine(self, start: Point, end: Point, symbol: str) -> None:
+        self.draw_polyline([start, end], symbol, closed=False)
 
     def draw_ortholine_exclusive_no_overlap(self, start: Point, end: Point, symbol: str) -> None:
+        self.draw_polyline([start, end], symbol, closed=False, exclusive=True, no_overlap=True)
+
+    def draw_polyline(self, points: Sequence[Point], symbol: str, closed: bool = True, exclusive: bool = False, no_overlap: bool = False) -> None:
         try:
             number: int = self.symbols.index(symbol)
         except ValueError:
-            raise AssertionError(f'unexpected symbol in flood fill: {symbol!r}')
-        if start.x == end.x:
-            self.__draw_vertical_ortholine(start.x, start.y, end.y, number)
-        elif start.y == end.y:
-            self.__draw_horizontal_ortholine(start.x, end.x, start.y, number)
-        else:
-            raise AssertionError('line is not ortholine')
+            raise AssertionError(f'unexpected symbol in line drawing: {symbol!r}')
+        assert (len(points) > 0), 'no points in polyline'
+        assert (exclusive or not no_overlap), 'overlap check needs exclusive lines, inclusive segments share their end points'
+        self.invalidate()
+        ends: Sequence[Point] = list(points[1:]) + [points[0]] if closed else points[1:]
+        for start, end in zip(points, ends):
+            line: np.ndarray = self.__ortholine_cells(start, end, exclusive)
+            if no_overlap:
+                assert (not (line == number).any()), f'line from {start} to {end} overlaps {symbol!r} already drawn'
+            line[...] = number
 
 
 class FrozenGrid:
@@ -300,10 +429,17 @@ class FrozenGrid:
     dimensions: Dimensions
     symbols: tuple[str, ...]
 
+    hash_value: int | None
+
     def __init__(self, grid: Grid) -> None:
-        self.cells = grid.cells.copy()
+        if grid.cells.flags.c_contiguous and is_immutable(grid.cells):
+            self.cells = grid.cells  # nothing can change it under us
+        else:
+            self.cells = np.ascontiguousarray(grid.cells).copy()
+            self.cells.flags.writeable = False
         self.dimensions = grid.dimensions
         self.symbols = grid.symbols
+        self.hash_value = None
 
     def __str__(self) -> str:
         rv: str = ''
@@ -321,13 +457,19 @@ class FrozenGrid:
         return self.symbols[self.cells[point.y, point.x]]
 
     def __hash__(self) -> int:
-        return hash((tuple(self.cells.reshape((-1, ))), self.symbols))
+        if self.hash_value is None:
+            digest: bytes = hashlib.blake2b(self.cells, digest_size=8).digest()  # reads the buffer in place, no per-cell objects
+            self.hash_value = hash((digest, self.cells.shape, self.symbols))
+        return self.hash_value
 
     def __eq__(self, other: Any) -> bool:
-        return (type(other) == Grid
+        if self is other:
+            return True
+        return (type(other) == FrozenGrid
+                and hash(self) == hash(other)
                 and self.symbols == other.symbols
                 and self.dimensions == other.dimensions
-                and self.cells.dtype is self.cells.dtype
+                and self.cells.dtype == other.cells.dtype
                 and np.array_equal(self.cells, other.cells))
 
     def unfreeze(self) -> Grid:
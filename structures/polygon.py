@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+import numpy as np
+
+from structures.points import Dimensions, Point
+
+
+def rectilinear_edges(vertices: Sequence[Point]) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    assert (len(vertices) >= 4), f'{len(vertices)} vertices do not make a rectilinear polygon'
+    x1: np.ndarray = np.array([vertex.x for vertex in vertices], dtype=np.int64)
+    y1: np.ndarray = np.array([vertex.y for vertex in vertices], dtype=np.int64)
+    x2: np.ndarray = np.roll(x1, -1)
+    y2: np.ndarray = np.roll(y1, -1)
+    assert (np.all((x1 == x2) | (y1 == y2))), 'polygon has an edge that is not horizontal or vertical'
+    return x1, y1, x2, y2
+
+
+def rectilinear_polygon_boundary(vertices: Sequence[Point], dimensions: Dimensions) -> np.ndarray:
+    x1, y1, x2, y2 = rectilinear_edges(vertices)
+    assert (np.all((x1 >= 0) & (x1 < dimensions.width) & (y1 >= 0) & (y1 < dimensions.height))), f'polygon does not fit in {dimensions}'
+    horizontal: np.ndarray = y1 == y2
+    runs: np.ndarray = np.zeros((dimensions.height, dimensions.width + 1), dtype=np.int32)
+    np.add.at(runs, (y1[horizontal], np.minimum(x1, x2)[horizontal]), 1)
+    np.add.at(runs, (y1[horizontal], np.maximum(x1, x2)[horizontal] + 1), -1)
+    columns: np.ndarray = np.zeros((dimensions.height + 1, dimensions.width), dtype=np.int32)
+    np.add.at(columns, (np.minimum(y1, y2)[~horizontal], x1[~horizontal]), 1)
+    np.add.at(columns, (np.maximum(y1, y2)[~horizontal] + 1, x1[~horizontal]), -1)
+    return (np.cumsum(runs, axis=1)[:, :-1] > 0) | (np.cumsum(columns, axis=0)[:-1] > 0)
+
+
+def rectilinear_polygon_mask(vertices: Sequence[Point], dimensions: Dimensions) -> np.ndarray:
+    x1, y1, x2, y2 = rectilinear_edges(vertices)
+    vertical: np.ndarray = (x1 == x2) & (y1 != y2)
+    # a ray through row y, nudged down, crosses vertical edges whose rows span top <= y < bottom
+    toggles: np.ndarray = np.zeros((dimensions.height + 1, dimensions.width + 1), dtype=np.uint8)
+    np.bitwise_xor.at(toggles, (np.minimum(y1, y2)[vertical], x1[vertical] + 1), 1)
+    np.bitwise_xor.at(toggles, (np.maximum(y1, y2)[vertical], x1[vertical] + 1), 1)
+    crossings: np.ndarray = np.bitwise_xor.accumulate(toggles, axis=0)
+    inside: np.ndarray = np.bitwise_xor.accumulate(crossings, axis=1)[:-1, :-1].view(np.bool_)
+    return inside | rectilinear_polygon_boundary(vertices, dimensions)